@@ -0,0 +1,337 @@
+'''
+Advent of Code - 2016 - Assembunny
+http://adventofcode.com/2016
+
+Last Updated: 2026-Oct-18
+First Created: 2026-Oct-18
+Python 3.5
+Chris
+
+One assembunny interpreter for Day 12, Day 23 and Day 25.
+
+The program is decoded once into (opcode, x, y) tuples of ints. Operands are indexes into
+one flat list of slots: the four registers a, b, c, d are slots 0-3, and each constant in
+the program gets a slot of its own after them. So cpy, jnz etc never have to check whether
+an operand is a register or a number, cpy x y is always slots[y] = slots[x].
+
+Instructions which make no sense (e.g cpy 1 2 after a tgl) decode to NOP and are skipped.
+tgl changes the source instruction and re-decodes just that one.
+
+With optimize, loops are spotted in the source and their first instruction is replaced by
+one fused instruction which does the whole loop at once:
+
+    ADD  - inc/dec x; inc/dec c; jnz c -2         (either order) x += c, c = 0
+    MUL  - cpy s t; <ADD loop on x, t>; inc/dec o; jnz o -5     x += s * o, t = 0, o = 0
+    ZERO - inc/dec c; jnz c -1                     c = 0
+
+The registers in a loop must all be different, and the loop counters must be counting
+towards 0 (otherwise the loop never ends). That is checked each time the fused
+instruction runs, and if it fails the original instruction is run instead. The rest of
+the loop is left as it was, so jumping into the middle of a loop still works.
+A fused loop covers at most 6 instructions, so when tgl changes instruction t, loops
+starting from t - 5 to t are looked for again.
+
+Tracing is opt in, Machine(..., trace=Trace()). A traced machine runs a separate (slower)
+loop which counts every instruction by opcode and by pc, and keeps the last few (sampled)
+instructions in a ring buffer, so memory doesn't grow with the run. The normal loop has no
+tracing code in it at all.
+
+'''
+
+from collections import Counter, deque
+
+REGISTERS = 'abcd'
+CPY, INC, DEC, JNZ, TGL, OUT, NOP, ADD, MUL, ZERO = range(10)
+OPCODES = {'cpy': CPY, 'inc': INC, 'dec': DEC, 'jnz': JNZ, 'tgl': TGL, 'out': OUT}
+FUSED_LENGTH = {ADD: 3, MUL: 6, ZERO: 2} # number of instructions each fused instruction replaces
+NAMES = {op: cmd for cmd, op in OPCODES.items()}
+NAMES.update({NOP: 'nop', ADD: 'add loop', MUL: 'mul loop', ZERO: 'zero loop'})
+
+
+def parse(lines):
+    '''
+    Return a list of instructions, e.g ['cpy', 41, 'a'], registers as letters and numbers as ints.
+    '''
+    return [[x if x.isalpha() else int(x) for x in line.split()] for line in lines if line.strip()]
+
+def get_program(filename):
+    with open(filename) as f:
+        return parse(f)
+
+def toggled(instruction):
+    '''
+    One argument instructions: inc becomes dec, everything else becomes inc.
+    Two argument instructions: jnz becomes cpy, everything else becomes jnz.
+    '''
+    cmd, args = instruction[0], instruction[1:]
+    if len(args) == 1:
+        return ['dec' if cmd == 'inc' else 'inc'] + args
+    return ['cpy' if cmd == 'jnz' else 'jnz'] + args
+
+
+def step_of(instruction):
+    '''
+    (register, +1 or -1) if instruction is inc or dec of a register, else None.
+    '''
+    if instruction[0] in ('inc', 'dec') and len(instruction) == 2 and isinstance(instruction[1], str):
+        return instruction[1], 1 if instruction[0] == 'inc' else -1
+    return None
+
+def add_loop(instructions):
+    '''
+    (x, dx, c, dc) if instructions start with inc/dec x; inc/dec c; jnz c -2 (x and c either way round), else None.
+    '''
+    if len(instructions) < 3:
+        return None
+    first, second = step_of(instructions[0]), step_of(instructions[1])
+    if first is None or second is None or first[0] == second[0]:
+        return None
+    for (x, dx), (c, dc) in ((first, second), (second, first)):
+        if instructions[2] == ['jnz', c, -2]:
+            return x, dx, c, dc
+    return None
+
+def fused_step(op, args, slots):
+    '''
+    Run a fused loop. Returns the number of instructions it stands in for, or 0 if a
+    counter isn't counting towards 0 (and nothing has been changed).
+    '''
+    if op == ADD:
+        x, dx, c, dc = args
+        n = slots[c] * -dc # times round the loop
+        if n <= 0:
+            return 0
+        slots[x] += dx * n
+        slots[c] = 0
+        return 3 * n
+    if op == MUL:
+        s, x, dx, t, dt, o, do = args
+        inner, outer = slots[s] * -dt, slots[o] * -do
+        if inner <= 0 or outer <= 0:
+            return 0
+        slots[x] += dx * inner * outer
+        slots[t] = slots[o] = 0
+        return outer * (3 * inner + 3)
+    if op == ZERO:
+        c, dc = args
+        n = slots[c] * -dc
+        if n <= 0:
+            return 0
+        slots[c] = 0
+        return 2 * n
+    raise ValueError('not a fused opcode: {}'.format(op))
+
+
+class Trace():
+    '''
+    Execution counts by opcode name and by pc, plus the last size instructions run
+    (only every sample_every'th one) as (step, pc, instruction, registers).
+    A fused loop counts as one instruction.
+    '''
+    def __init__(self, size=1000, sample_every=1):
+        self.recent = deque(maxlen=size)
+        self.sample_every = sample_every
+        self.seen = 0 # instructions dispatched
+        self.opcodes = Counter()
+        self.pcs = Counter()
+
+    def record(self, machine, pc, op):
+        self.opcodes[NAMES[op]] += 1
+        self.pcs[pc] += 1
+        if self.seen % self.sample_every == 0:
+            self.recent.append((machine.steps, pc, ' '.join(str(x) for x in machine.program[pc]), machine.registers))
+        self.seen += 1
+
+    def report(self, top=10):
+        lines = ['opcodes: {}'.format(', '.join('{} {}'.format(name, count) for name, count in self.opcodes.most_common()))]
+        lines.append('busiest pcs: {}'.format(', '.join('{} ({})'.format(pc, count) for pc, count in self.pcs.most_common(top))))
+        return '\n'.join(lines)
+
+    def write(self, filename):
+        with open(filename, 'w') as f:
+            f.write(self.report() + '\n\n')
+            f.write('\n'.join('{} {} {} {}'.format(*line) for line in self.recent))
+
+
+class Machine():
+    '''
+    Runs a program (list of instructions, see parse) with its own copy, so tgl never changes
+    the caller's list. registers is a dict of starting values, e.g {'a': 7}, others start at 0.
+    optimize fuses loops, trace is a Trace to fill in (see module docstring).
+    '''
+    def __init__(self, program, registers=None, optimize=True, trace=None):
+        self.program = [list(instruction) for instruction in program]
+        self.slots = [0] * len(REGISTERS)
+        self.constants = {} # number -> slot
+        for register, value in (registers or {}).items():
+            self.slots[REGISTERS.index(register)] = value
+        self.optimize = optimize
+        self.plain = [self.decode(instruction) for instruction in self.program] # without fused loops
+        self.code = self.plain[:]
+        if optimize:
+            for head in range(len(self.code)):
+                self.code[head] = self.fuse(head) or self.plain[head]
+        self.pc = 0
+        self.steps = 0 # instructions executed
+        self.trace = trace
+        self.version = 0 # number of times tgl has changed the program
+
+    @property
+    def registers(self):
+        return dict(zip(REGISTERS, self.slots))
+
+    def snapshot(self):
+        '''
+        Everything the rest of the run depends on: (pc, registers, program version).
+        The program only changes through tgl, so its version stands in for the whole program.
+        '''
+        return self.pc, tuple(self.slots[:len(REGISTERS)]), self.version
+
+    def operand(self, arg):
+        '''
+        Slot for arg, a register letter or a number.
+        '''
+        if isinstance(arg, str):
+            return REGISTERS.index(arg)
+        if arg not in self.constants:
+            self.constants[arg] = len(self.slots)
+            self.slots.append(arg)
+        return self.constants[arg]
+
+    def decode(self, instruction):
+        cmd, args = instruction[0], instruction[1:]
+        op = OPCODES[cmd]
+        if op in (CPY, JNZ):
+            if len(args) != 2 or (op == CPY and not isinstance(args[1], str)):
+                return (NOP, 0, 0)
+            return (op, self.operand(args[0]), self.operand(args[1]))
+        if len(args) != 1 or (op in (INC, DEC) and not isinstance(args[0], str)):
+            return (NOP, 0, 0)
+        return (op, self.operand(args[0]), 0)
+
+    def fuse(self, head):
+        '''
+        Fused instruction for a loop starting at head, or None if there isn't one.
+        '''
+        program = self.program
+        mul = add_loop(program[head + 1:head + 4])
+        if mul and program[head][0] == 'cpy' and len(program[head]) == 3 and head + 5 < len(program):
+            _, s, t = program[head]
+            x, dx, c, dt = mul
+            out = step_of(program[head + 4])
+            if out and c == t and program[head + 5] == ['jnz', out[0], -5]:
+                o, do = out
+                if len({x, t, o}) == 3 and s not in (x, t, o):
+                    return (MUL, (self.operand(s), self.operand(x), dx, self.operand(t), dt, self.operand(o), do), 0)
+
+        add = add_loop(program[head:head + 3])
+        if add:
+            x, dx, c, dc = add
+            return (ADD, (self.operand(x), dx, self.operand(c), dc), 0)
+
+        zero = step_of(program[head])
+        if zero and head + 1 < len(program) and program[head + 1] == ['jnz', zero[0], -1]:
+            return (ZERO, (self.operand(zero[0]), zero[1]), 0)
+        return None
+
+    def toggle(self, idx):
+        if 0 <= idx < len(self.program):
+            self.program[idx] = toggled(self.program[idx])
+            self.version += 1
+            self.plain[idx] = self.decode(self.program[idx])
+            self.code[idx] = self.plain[idx]
+            if self.optimize: # any loop which includes idx
+                for head in range(max(0, idx - 5), idx + 1):
+                    self.code[head] = self.fuse(head) or self.plain[head]
+
+    def execute(self):
+        '''
+        Generator. Runs until the program counter leaves the program, yielding each value
+        sent by out (Day 25 never halts, so stop reading when you have enough).
+        '''
+        if self.trace is not None:
+            yield from self.execute_traced()
+            return
+        code, plain, slots = self.code, self.plain, self.slots # toggle changes these lists in place
+        pc, steps = self.pc, self.steps
+        end = len(code)
+        while 0 <= pc < end:
+            op, x, y = code[pc]
+            steps += 1
+            if op == JNZ:
+                if slots[x]:
+                    pc += slots[y]
+                    continue
+            elif op == INC:
+                slots[x] += 1
+            elif op == DEC:
+                slots[x] -= 1
+            elif op == CPY:
+                slots[y] = slots[x]
+            elif op == TGL:
+                self.toggle(pc + slots[x])
+            elif op == OUT:
+                self.pc, self.steps = pc + 1, steps
+                yield slots[x]
+                steps = self.steps
+            elif op != NOP:
+                done = fused_step(op, x, slots)
+                if done:
+                    steps += done - 1
+                    pc += FUSED_LENGTH[op]
+                    continue
+                op, x, y = plain[pc] # run the first instruction of the loop as normal
+                if op == INC:
+                    slots[x] += 1
+                elif op == DEC:
+                    slots[x] -= 1
+                elif op == CPY:
+                    slots[y] = slots[x]
+            pc += 1
+        self.pc, self.steps = pc, steps
+
+    def step(self, pc):
+        '''
+        Run the instruction at pc (the whole loop if it's fused), the same as execute.
+        Returns (next pc, instructions executed, value sent by out or None).
+        '''
+        slots = self.slots
+        op, x, y = self.code[pc]
+        if op >= ADD:
+            done = fused_step(op, x, slots)
+            if done:
+                return pc + FUSED_LENGTH[op], done, None
+            op, x, y = self.plain[pc]
+        if op == JNZ:
+            return pc + (slots[y] if slots[x] else 1), 1, None
+        if op == INC:
+            slots[x] += 1
+        elif op == DEC:
+            slots[x] -= 1
+        elif op == CPY:
+            slots[y] = slots[x]
+        elif op == TGL:
+            self.toggle(pc + slots[x])
+        elif op == OUT:
+            return pc + 1, 1, slots[x]
+        return pc + 1, 1, None
+
+    def execute_traced(self):
+        '''
+        execute, one step at a time, recording each instruction in self.trace.
+        '''
+        trace, code = self.trace, self.code
+        while 0 <= self.pc < len(code):
+            trace.record(self, self.pc, code[self.pc][0])
+            self.pc, done, value = self.step(self.pc)
+            self.steps += done
+            if value is not None:
+                yield value
+
+    def run(self):
+        '''
+        Run to the end, returns the registers. (Any out values are thrown away.)
+        '''
+        for _ in self.execute():
+            pass
+        return self.registers
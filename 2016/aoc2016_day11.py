@@ -3,7 +3,7 @@
 Advent of Code - 2016 - Day 11
 http://adventofcode.com/2016
 
-Last Updated: 2017-Feb-21
+Last Updated: 2026-Oct-18
 First Created: 2017-Feb-03
 Python 3.5
 Chris
@@ -157,45 +157,19 @@ Your puzzle answer was 57.
 
 '''
 
-import heapq
 import math
+import random
 from collections import namedtuple, defaultdict
+from functools import partial
 from itertools import chain, combinations
 import re
 from timeit import default_timer as timer
 
-### basic Astar start ***
+from aoc2016_search import SearchStats, astar_search, path_length
 
-def Path(previous, state):
-    return ([] if state is None else Path(previous, previous[state]) + [state])
-
-def astar_search(start, h_func, moves_func, materials):
-    frontier = [(h_func(start), start)]
-    previous = {start: None}
-    path_cost = {start: 0}
-    unique_states = set()
-    unique_items_state(start, unique_states, materials)
-
-    while frontier:
-        (f, s) = heapq.heappop(frontier)
-        print('Distance to goal: {}, No. of States: {}'.format(h_func(s), len(unique_states)))
-        if h_func(s) == 0:
-            return Path(previous, s)
-        for s2 in moves_func(s):
-            new_cost = path_cost[s] + 1
-            if unique_items_state(s2, unique_states, materials): # added this to speed up Q11 part 2
-            #if s2 not in path_cost or new_cost < path_cost[s2]:
-                heapq.heappush(frontier, (h_func(s2) + new_cost, s2))
-                previous[s2] = s
-                path_cost[s2] = new_cost
-
-    return previous # if fail to find a path
-
-### basic Astar end ###
-
-def unique_items_state(state, unique_states, materials):
+def unique_items_state(state, materials):
     '''
-    Takes a state and checks it is unique.
+    Canonical key for a state, used by astar_search to check it is unique.
     For example State(0, {aG, aM}, {}, {tM}, {tG}) is the same as State(0, {tG, tM}, {}, {aM}, {aG}),
     therefore we only want to include one of these paths.
     '''
@@ -208,13 +182,223 @@ def unique_items_state(state, unique_states, materials):
             material_pairs[material][is_chip] = idx
 
     # per example in docs, both States would result in (0, (0, 0), (3, 2)).
-    mat_pairs = tuple([state.elevator] + sorted(tuple(x) for x in material_pairs.values()))
+    return tuple([state.elevator] + sorted(tuple(x) for x in material_pairs.values()))
 
-    if mat_pairs in unique_states:
-        return False
-    else:
-        unique_states.add(mat_pairs)
-        return True
+class Facility():
+    '''
+    The same puzzle with each state packed into one int, rather than frozensets of strings.
+
+    One byte each, from the lowest: the elevator floor, then a (generator floor, chip floor) pair
+    per material. Pairs are sorted, so states which only differ by swapping materials (see
+    unique_items_state) are the same int, and which material is which is never stored.
+    A pair value is generator floor + (chip floor << bits), bits = 4 so up to 16 floors fit in a byte.
+    Using bytes lets int.from_bytes / to_bytes do the packing rather than a python loop.
+
+    If prune, moves never goes down when every floor below the elevator is empty.
+    That isn't always safe: an empty floor can be the only place to leave a chip away from
+    the generators (e.g solve_rtg([(1, 1), (1, 1), (2, 2), (0, 1)], 3) needs it), so solve_rtg
+    searches again without pruning if the pruned search finds nothing.
+    '''
+    bits = 4
+    floor_mask = 15
+
+    def __init__(self, num_pairs, num_floors=4, prune=False):
+        if num_floors > 16:
+            raise ValueError('Facility only packs up to 16 floors')
+        self.num_pairs = num_pairs
+        self.top = num_floors - 1
+        self.prune = prune
+
+        # for each pair value, the floor (as a bit) of its generator, and of its chip if it's
+        # not with its generator. A set of pairs is legal if no unpaired chip shares a floor with any generator.
+        # (used in moves)
+        self.gen_floor = []
+        self.lone_chip = []
+        self.below_top = [] # number of floors the pair's two items are below the top, for h_to_top
+        for pair in range(256):
+            gen, chip = pair & self.floor_mask, pair >> self.bits
+            self.gen_floor.append(1 << gen)
+            self.lone_chip.append(0 if gen == chip else 1 << chip)
+            self.below_top.append(2 * self.top - gen - chip)
+
+    def encode(self, elevator, pairs):
+        '''
+        pairs are pair values.
+        '''
+        return int.from_bytes(bytes([elevator] + sorted(pairs)), 'little')
+
+    def decode(self, state):
+        '''
+        Return (elevator, list of pair values).
+        '''
+        data = state.to_bytes(self.num_pairs + 1, 'little')
+        return data[0], list(data[1:])
+
+    def start_state(self, elevator, floor_pairs):
+        '''
+        floor_pairs is a list of (generator floor, chip floor), one per material.
+        '''
+        return self.encode(elevator, [gen | (chip << self.bits) for gen, chip in floor_pairs])
+
+    def moves(self, state):
+        '''
+        Take one or two items on the elevator floor up or down a floor.
+        Moving an item is adding +1 / -1 to its part of its pair value.
+        (The legal check and encode are inlined, this is the hot loop.)
+        '''
+        bits, floor_mask = self.bits, self.floor_mask
+        gen_floor, lone_chip = self.gen_floor, self.lone_chip
+        elevator, pairs = self.decode(state)
+        items = [] # (pair index, +1 for a generator, or +1 << bits for a chip)
+        for idx, pair in enumerate(pairs):
+            if pair & floor_mask == elevator:
+                items.append((idx, 1))
+            if pair >> bits == elevator:
+                items.append((idx, 1 << bits))
+
+        for new_floor in (elevator + 1, elevator - 1):
+            if not 0 <= new_floor <= self.top:
+                continue
+            direction = new_floor - elevator
+            if direction == -1 and self.prune and all(pair & floor_mask >= elevator and pair >> bits >= elevator for pair in pairs):
+                continue # every floor below is empty
+            for combo in chain(combinations(items, 1), combinations(items, 2)):
+                new_pairs = pairs[:]
+                for idx, step in combo:
+                    new_pairs[idx] += step * direction
+                gens = lone_chips = 0
+                for pair in new_pairs:
+                    gens |= gen_floor[pair]
+                    lone_chips |= lone_chip[pair]
+                if gens & lone_chips:
+                    continue
+                new_pairs.sort()
+                yield int.from_bytes(bytes([new_floor] + new_pairs), 'little')
+
+    def h_to_top(self, state):
+        '''
+        Same as q11 h_to_top: half the total number of floors items are below the top.
+        '''
+        below_top = self.below_top
+        total = sum(below_top[pair] for pair in state.to_bytes(self.num_pairs + 1, 'little')[1:])
+        return (total + 1) // 2
+
+    def h_crossings(self, state):
+        '''
+        Lower bound on moves from how often the elevator must cross each gap between floors.
+        Each trip up a gap carries at most 2 items, each trip back down carries at least 1.
+        With c items at or below the gap: if the elevator is below it, that is at least
+        2c - 3 crossings (1 if c == 1); if it is above, at least 2c (it has to come back for them).
+        Much tighter than h_to_top once there are more than 4 floors.
+        '''
+        elevator, pairs = self.decode(state)
+        on_floor = [0] * (self.top + 1)
+        for pair in pairs:
+            on_floor[pair & self.floor_mask] += 1
+            on_floor[pair >> self.bits] += 1
+        total = below = 0
+        for floor in range(self.top):
+            below += on_floor[floor]
+            if not below:
+                continue
+            if floor < elevator:
+                total += 2 * below
+            else:
+                total += max(2 * below - 3, 1)
+        return total
+
+    def show(self, state):
+        elevator, pairs = self.decode(state)
+        return 'Elevator: {}, Pairs (G, M): {}'.format(elevator, [(pair & self.floor_mask, pair >> self.bits) for pair in pairs])
+
+def items_to_pairs(floor_items):
+    '''
+    floor_items is a list of floors, each a list of items like 'RG' (R generator) and 'RM' (R microchip),
+    the same format as q11 State floors.
+    Return a list of (generator floor, chip floor), one per material.
+    '''
+    material_pairs = defaultdict(lambda: [0, 0])
+    for floor, items in enumerate(floor_items):
+        for item in items:
+            material_pairs[item[:-1]][item[-1] == 'M'] = floor # [G_floor, M_floor]
+    return [tuple(x) for x in material_pairs.values()]
+
+def solve_rtg(floor_pairs, num_floors=4, prune=True, print_statements=True):
+    '''
+    Solve for any number of floors and materials.
+    floor_pairs is a list of (generator floor, chip floor), one per material (see items_to_pairs, parse_pairs).
+    Returns (no. of moves, SearchStats). No. of moves is None if it can't be done.
+    If the pruned search (see Facility) finds nothing, the search is run again without pruning,
+    stats covers both.
+    '''
+    stats = SearchStats()
+    start = Facility(len(floor_pairs), num_floors).start_state(0, floor_pairs)
+    for pruning in ((True, False) if prune else (False,)):
+        facility = Facility(len(floor_pairs), num_floors, pruning)
+        ans = astar_search(start, facility.h_crossings, facility.moves,
+                           goal_func=lambda s: facility.h_to_top(s) == 0, stats=stats, reconstruct=path_length)
+        if ans:
+            break
+    ans = ans - 1 if ans else None
+    if print_statements:
+        print('no. of moves: {}'.format(ans))
+        print(stats)
+    return ans, stats
+
+def scaling_report(pair_counts=range(2, 12), num_floors=(4, 5)):
+    '''
+    Everything starts on the bottom floor. Print the moves, search size and time as the number
+    of materials (and floors) goes up, and the states pruning takes out of the search
+    (expanded / generated without it minus with it).
+    Moves are 12n - 9 for 4 floors, 16n - 12 for 5 (4(f - 1)n - 3(f - 1)).
+    Rough times (pruned search only): 4 floors - 11 pairs ~ 4 secs, 14 pairs ~ 14 secs.
+                                      5 floors - 6 pairs ~ 1 sec, 8 pairs ~ 7 secs.
+                                      6 floors - 4 pairs ~ 0.5 secs, 6 pairs ~ 9 secs, so 10-15 pairs on 5-6 floors is hours.
+    The report runs each search twice (with and without pruning), so takes over twice as long.
+    Pruning saves little: with everything starting on the bottom floor no fewer states are
+    expanded, only ~3-7% fewer generated. Part two expands 4846 states instead of 5060.
+    '''
+    for floors in num_floors:
+        for num_pairs in pair_counts:
+            moves, stats = solve_rtg([(0, 0)] * num_pairs, floors, print_statements=False)
+            _, unpruned = solve_rtg([(0, 0)] * num_pairs, floors, prune=False, print_statements=False)
+            print('floors: {}, pairs: {:2}, moves: {:3}, expanded: {:7}, time: {:7.2f} secs, pruning saved: {} expanded, {} generated'.format(
+                  floors, num_pairs, moves, stats.expanded, stats.time,
+                  unpruned.expanded - stats.expanded, unpruned.generated - stats.generated))
+
+PRUNING_CASES = [([(2, 2), (0, 0), (3, 3), (2, 2)], 4, 17), # (floor_pairs, num_floors, moves)
+                 ([(1, 1), (1, 1), (2, 2), (0, 1)], 3, 18)]
+
+def check_pruning(trials=200, num_pairs=4, floor_counts=(2, 3, 4, 5), seed=0):
+    '''
+    Pruning must never change the answer: compare prune=True with prune=False on
+    PRUNING_CASES and on trials random starts for each number of floors.
+    Returns the list of (floor_pairs, num_floors) where they disagree.
+    '''
+    rng = random.Random(seed)
+    cases = [(floor_pairs, floors) for floor_pairs, floors, _ in PRUNING_CASES]
+    for floors in floor_counts:
+        for _ in range(trials):
+            cases.append(([(rng.randrange(floors), rng.randrange(floors)) for _ in range(rng.randint(1, num_pairs))], floors))
+    bad = []
+    for floor_pairs, floors in cases:
+        pruned = solve_rtg(floor_pairs, floors, prune=True, print_statements=False)[0]
+        unpruned = solve_rtg(floor_pairs, floors, prune=False, print_statements=False)[0]
+        if pruned != unpruned:
+            bad.append((floor_pairs, floors))
+    return bad
+
+def parse_pairs(filename):
+    '''
+    Return a list of (generator floor, chip floor), one per material, and the number of floors.
+    '''
+    material_pairs = defaultdict(lambda: [0, 0])
+    with open(filename, 'r') as f:
+        lines = f.read().splitlines()
+    for floor, line in enumerate(lines):
+        for gen, chip in re.findall(r'(\w+) generator|(\w+)-compatible microchip', line):
+            material_pairs[gen or chip][not gen] = floor # [G_floor, M_floor]
+    return [tuple(x) for x in material_pairs.values()], len(lines)
 
 def q11():
     State = namedtuple('State', ['elevator', 'floors'])
@@ -274,20 +458,43 @@ def q11():
         # part_one, materials = parse('aoc2016_day11.txt')
         part_two, materials = parse('aoc2016_day11_part_two.txt')
 
-        ans = astar_search(part_two, h_to_top, moves, materials)
+        stats = SearchStats()
+        ans = astar_search(part_two, h_to_top, moves, key_func=partial(unique_items_state, materials=materials), stats=stats)
         for step in ans:
             print(step)
+        print(stats)
+        print('no. of moves: {}'.format(len(ans) - 1))
+
+    @time_func
+    def solve_packed():
+        floor_pairs, num_floors = parse_pairs('aoc2016_day11_part_two.txt')
+        facility = Facility(len(floor_pairs), num_floors)
+
+        stats = SearchStats()
+        ans = astar_search(facility.start_state(0, floor_pairs), facility.h_to_top, facility.moves, stats=stats)
+        for step in ans:
+            print(facility.show(step))
+        print(stats)
         print('no. of moves: {}'.format(len(ans) - 1))
 
+    @time_func
+    def solve_pruned():
+        solve_rtg(*parse_pairs('aoc2016_day11.txt'))
+        solve_rtg(*parse_pairs('aoc2016_day11_part_two.txt'))
+
     def test():
         easy = State(0, (fs('RG'), frozenset(), fs('RM'), fs('LG', 'LM')))
         easy = State(0, (fs('TM'), fs('RM'), fs('RG'), fs('LG', 'LM', 'TG')))
         materials = set(['R', 'L', 'T'])
 
-        ans = astar_search(easy, h_to_top, moves, materials)
+        ans = astar_search(easy, h_to_top, moves, key_func=partial(unique_items_state, materials=materials))
         for step in ans:
             print(step)
 
-    solve()
+    # solve() # ~ 5 secs
+    # solve_packed() # ~ 0.6 secs
+    solve_pruned()
+    # scaling_report()
+    # print(check_pruning()) # []
 
 q11()
@@ -2,7 +2,7 @@
 Advent of Code - 2016 - Day 12
 http://adventofcode.com/2016
 
-Last Updated: 2017-Feb-22
+Last Updated: 2026-Oct-18
 First Created: 2017-Feb-21
 Python 3.5
 Chris
@@ -61,6 +61,8 @@ Both parts of this puzzle are complete! They provide two gold stars: **
 
 '''
 
+from aoc2016_assembunny import Machine
+
 def is_int(s):
     try:
         int(s)
@@ -75,43 +77,49 @@ def get_data(filename='aoc2016_day12.txt'):
             commands.append([x if x.isalpha() else int(x) for x in line.split()])
     return commands
 
-commands = get_data()
-
-vals = {'a': 0, 'b': 0, 'c': 0, 'd': 0} # part one
-vals = {'a': 0, 'b': 0, 'c': 1, 'd': 0} # part two
-
-idx = 0
-moves_made = []
-
-while idx < len(commands):
-    command = commands[idx]
-    cmd, x, y = command[0], command[1], command[-1]
-
-    if cmd in ('inc', 'dec'):
-        vals[x] += (cmd == 'inc') or -1 # if inc then this is 1, if it's dec then it's -1
-    elif cmd == 'cpy':
-        if is_int(x):
-            vals[y] = x
-        else:
-            vals[y] = vals[x]
-    elif cmd == 'jnz':
-        if (is_int(x) and x > 0) or (not is_int(x) and vals[x] > 0):
-            if y == -2:
-                # there are several loops which involve increase 1, decrease 1
-                # using this we do it in one go rather than repeating the same commands thousands of times.
-                (cmd_a, val_a), (cmd_b, val_b) = moves_made[-2:] # get the last two moves before jnz 2, e.g (inc b, dec c)
-                if cmd_a == 'dec':
-                    vals[val_b] += vals[val_a]
-                    vals[val_a] = 0
-                else:
-                    vals[val_a] += vals[val_b]
-                    vals[val_b] = 0
+def run_old(commands, vals):
+    '''
+    Original interpreter, see aoc2016_assembunny for the one in use.
+    '''
+    idx = 0
+    moves_made = []
+
+    while idx < len(commands):
+        command = commands[idx]
+        cmd, x, y = command[0], command[1], command[-1]
+
+        if cmd in ('inc', 'dec'):
+            vals[x] += (cmd == 'inc') or -1 # if inc then this is 1, if it's dec then it's -1
+        elif cmd == 'cpy':
+            if is_int(x):
+                vals[y] = x
             else:
-                idx += y - 1
-    else:
-        print('unexpected command')
+                vals[y] = vals[x]
+        elif cmd == 'jnz':
+            if (is_int(x) and x > 0) or (not is_int(x) and vals[x] > 0):
+                if y == -2:
+                    # there are several loops which involve increase 1, decrease 1
+                    # using this we do it in one go rather than repeating the same commands thousands of times.
+                    (cmd_a, val_a), (cmd_b, val_b) = moves_made[-2:] # get the last two moves before jnz 2, e.g (inc b, dec c)
+                    if cmd_a == 'dec':
+                        vals[val_b] += vals[val_a]
+                        vals[val_a] = 0
+                    else:
+                        vals[val_a] += vals[val_b]
+                        vals[val_b] = 0
+                else:
+                    idx += y - 1
+        else:
+            print('unexpected command')
+
+        moves_made.append(command)
+        idx += 1
+    return vals
 
-    moves_made.append(command)
-    idx += 1
+commands = get_data()
 
-print(vals)
+# print(run_old(commands, {'a': 0, 'b': 0, 'c': 1, 'd': 0}))
+ans1 = Machine(commands).run() # part one
+print(ans1, ans1['a'] == 318020)
+ans2 = Machine(commands, {'c': 1}).run() # part two
+print(ans2, ans2['a'] == 9227674)
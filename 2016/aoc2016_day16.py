@@ -2,7 +2,7 @@
 Advent of Code - 2016 - Day 16
 http://adventofcode.com/2016
 
-Last Updated: 2017-Feb-24
+Last Updated: 2026-Oct-18
 First Created: 2017-Feb-23
 Python 3.5
 Chris
@@ -109,7 +109,94 @@ def dragon_checksum(data, disk_space, print_statements=False):
         data = ['1' if data[idx] == data[idx + 1] else '0' for idx in range(0, len(data), 2)]
     return ''.join(str(x) for x in data)
 
+TO_BITS = bytes.maketrans(b'01', b'\x00\x01')
+FLIP = bytes.maketrans(b'\x00\x01', b'\x01\x00')
+TO_TEXT = bytes.maketrans(b'\x00\x01', b'01')
+
+def dragon_checksum_bytes(data, disk_space, print_statements=False):
+    '''
+    Same as dragon_checksum, with the disk as a bytearray of 0 / 1 bytes instead of a str and lists.
+
+    Each fill step adds 0 and the whole disk reversed ([::-1]) and flipped (translate).
+    Each checksum round reads the even and odd bytes as two big ints: even ^ odd has a 1 byte
+    wherever a pair differs, and flipping that gives the XNOR, all in C loops.
+    One byte per character, rather than a str plus a list of pointers to '0' / '1'.
+    '''
+    disk = bytearray(data.encode('utf-8').translate(TO_BITS))
+    while len(disk) < disk_space:
+        disk += b'\x00' + disk[::-1].translate(FLIP)
+        if print_statements: print(len(disk))
+
+    del disk[disk_space:]
+
+    while len(disk) % 2 == 0:
+        if print_statements: print(len(disk))
+        half = len(disk) // 2
+        even, odd = disk[0::2], disk[1::2]
+        del disk
+        pairs = int.from_bytes(even, 'big') ^ int.from_bytes(odd, 'big')
+        del even, odd
+        disk = pairs.to_bytes(half, 'big').translate(FLIP)
+    return disk.translate(TO_TEXT).decode('utf-8')
+
+def separator_ones(k):
+    '''
+    Number of 1s among the first k separators (the dragon curve sequence, 0010011...).
+    Separator i = 2^j * m (m odd) is 1 if m % 4 == 3, so for each j count the
+    m <= k // 2^j with m % 4 == 3.
+    '''
+    ones = 0
+    while k:
+        ones += (k + 1) // 4
+        k //= 2
+    return ones
+
+def dragon_checksum_parity(data, disk_space):
+    '''
+    Same answer as dragon_checksum without building the disk.
+
+    The filled disk is a, 0, b, ?, a, ?, b, ?... where b is a reversed and flipped, and the ?s
+    are the dragon curve separators (see separator_ones). So the number of 1s in the first n
+    characters can be counted in O(log n) - whole a / b blocks, separators, then part of a block.
+
+    Each checksum character comes from a chunk of size disk_space & -disk_space (the largest
+    power of 2 dividing it). Every round of pairs is an XNOR, and pairs of XNORs cancel the NOT,
+    so for chunks of 2 or more the character is 1 if the chunk has an even number of 1s.
+    (Chunks of 1 means an odd disk_space, the checksum is just the disk.)
+
+    Fast when the checksum is short (part two is 17 characters), but it's still one character
+    at a time, e.g disk_space = 10 ** 12 has a 244140625 character checksum.
+    '''
+    bits = [int(x) for x in data]
+    size = len(bits)
+    prefix_a = [0]
+    for bit in bits:
+        prefix_a.append(prefix_a[-1] + bit)
+    ones_a = prefix_a[-1]
+    ones_b = size - ones_a
+
+    def ones_before(n):
+        blocks, part = divmod(n, size + 1) # whole (block + separator) pairs, then part of the next block
+        ones = (blocks + 1) // 2 * ones_a + blocks // 2 * ones_b + separator_ones(blocks)
+        if blocks % 2 == 0:
+            return ones + prefix_a[part]
+        return ones + part - (ones_a - prefix_a[size - part]) # first part of b is the flipped last part of a
+
+    chunk = disk_space & -disk_space
+    checksum = []
+    previous = 0
+    for end in range(chunk, disk_space + 1, chunk):
+        ones = ones_before(end)
+        if chunk == 1:
+            checksum.append(str(ones - previous))
+        else:
+            checksum.append('1' if (ones - previous) % 2 == 0 else '0')
+        previous = ones
+    return ''.join(checksum)
+
 print(dragon_checksum('110010110100', 12), '100')
 print(dragon_checksum('10000', 20), '01100')
 print(dragon_checksum('10001110011110000', 272), '10010101010011101') # my puzzle input
-print(dragon_checksum('10001110011110000', 35651584, print_statements=True), '01100111101101111') # my puzzle input
+# print(dragon_checksum('10001110011110000', 35651584, print_statements=True), '01100111101101111') # ~ 13 secs
+# print(dragon_checksum_bytes('10001110011110000', 35651584), '01100111101101111') # ~ 0.5 secs
+print(dragon_checksum_parity('10001110011110000', 35651584), '01100111101101111') # my puzzle input
@@ -2,7 +2,7 @@
 Advent of Code - 2016 - Day 17
 http://adventofcode.com/2016
 
-Last Updated: 2017-Feb-25
+Last Updated: 2026-Oct-18
 First Created: 2017-Feb-24
 Python 3.5
 Chris
@@ -77,30 +77,53 @@ Both parts of this puzzle are complete! They provide two gold stars: **
 
 
 '''
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import hashlib
-import heapq
-from collections import namedtuple
+from itertools import repeat
+import os
 
+from aoc2016_md5 import PrefixHasher
+from aoc2016_search import astar_search
 
-def astar_search(start, h_func, moves_func):
+
+def find_md5_hash(hasher, path):
+    '''
+    Find md5 hash of puzzle_input + path, and return first four hex digits as ints.
+    hasher has already hashed puzzle_input, and the digits are read straight from the digest bytes.
+    '''
+    digest = hasher.digest(path)
+    return (digest[0] >> 4, digest[0] & 15, digest[1] >> 4, digest[1] & 15)
+
+def moves_func(state, hasher, grid_size=4):
+    '''
+    First four digits of hash represent UP DOWN LEFT RIGHT.
+    If digit is b, c, d, e, f (i.e > 10) AND fits within the walls (represented by 4x4 grid), door is open.
+    '''
+    directions = (('U', (0, -1)), ('D', (0, 1)), ('L', (-1, 0)), ('R', (1, 0)))
+
+    door_digits = find_md5_hash(hasher, state.path)
+
+    for idx, digit in enumerate(door_digits):
+        # x, y = state.position
+        # dx, dy = directions[idx][1]
+        # new_position = (x + dx, y + dy)
+        new_position = tuple((sum(x) for x in zip(state.position, directions[idx][1])))
+        if digit > 10 and all(0 <= x < grid_size for x in new_position):
+            yield State(new_position, state.path + directions[idx][0])
+
+def h_func(state, goal=(3, 3)):
+    return sum(abs(x - y) for x, y in zip(state.position, goal))
+
+
+def solve(passcode):
     '''
     Checks ALL paths that reach goal state.
     Returns smallest path directions (e.g UURLDU) and longest path length (e.g 370).
     '''
-    frontier = [(h_func(start), start)]
-    path_cost = {start: 0}
-    ans = []
-
-    while frontier:
-        f, s = heapq.heappop(frontier)
-        if h_func(s) == 0:
-            ans.append(s.data_hash[len(start.data_hash):])
-        else:
-            new_cost = path_cost[s] + 1
-            for s2 in moves_func(s):
-                if s2 not in path_cost or new_cost < path_cost[s2]:
-                    heapq.heappush(frontier, (h_func(s2) + new_cost, s2))
-                    path_cost[s2] = new_cost
+    ans = astar_search(State((0, 0), ''), h_func, partial(moves_func, hasher=PrefixHasher(passcode)), all_goals=True,
+                       reconstruct=lambda previous, s: s.path) # the directions are in the goal state
 
     try:
         return min(ans, key=len), len(max(ans, key=len))
@@ -108,38 +131,139 @@ def astar_search(start, h_func, moves_func):
         return 'Fail'
 
 
-def find_md5_hash(data):
+DIRECTIONS = ((b'U', 0, -1), (b'D', 0, 1), (b'L', -1, 0), (b'R', 1, 0))
+
+def next_rooms(md5_hash, x, y, grid_size=4):
+    '''
+    Generator. md5_hash has already hashed passcode + path to (x, y).
+    Yields (md5 hash with the step added, new x, new y, step) for each open door.
+    Only the new step is hashed, the rest is copied from md5_hash.
     '''
-    Find md5 hash of puzzle_input + moves_dict, and return first four chars.
+    digest = md5_hash.digest()
+    door_digits = (digest[0] >> 4, digest[0] & 15, digest[1] >> 4, digest[1] & 15)
+    for digit, (step, dx, dy) in zip(door_digits, DIRECTIONS):
+        x2, y2 = x + dx, y + dy
+        if digit > 10 and 0 <= x2 < grid_size and 0 <= y2 < grid_size:
+            new_hash = md5_hash.copy()
+            new_hash.update(step)
+            yield new_hash, x2, y2, step
+
+def shortest_path(passcode, path='', start=(0, 0), goal=(3, 3)):
     '''
-    return hashlib.md5(data.encode('utf-8')).hexdigest()[:4]
+    Breadth first, so the first path to reach the vault is a shortest one.
+    path is the path already taken to reach start (for searching a subtree).
+    Returns the path (e.g 'DDRRRD'), or None if the vault can't be reached.
+    '''
+    frontier = deque([(hashlib.md5((passcode + path).encode('utf-8')), start[0], start[1], path.encode('utf-8'))])
+    while frontier:
+        md5_hash, x, y, path = frontier.popleft()
+        if (x, y) == goal:
+            return path.decode('utf-8')
+        for new_hash, x2, y2, step in next_rooms(md5_hash, x, y):
+            frontier.append((new_hash, x2, y2, path + step))
+    return None
+
+def longest_path_length(passcode, path='', start=(0, 0), goal=(3, 3)):
+    '''
+    Iterative depth first search over every path, returns the length of the longest one
+    that reaches the vault (None if none do).
+    Paths stop at the vault. The stack only holds the unexplored doors along the current
+    path (at most 3 per step), so memory goes with the path depth, not the number of paths.
+    The path itself is never needed, only the md5 state and the depth.
+    path is the path already taken to reach start (for searching a subtree).
+    '''
+    longest = None
+    stack = [(hashlib.md5((passcode + path).encode('utf-8')), start[0], start[1], len(path))]
+    while stack:
+        md5_hash, x, y, depth = stack.pop()
+        if (x, y) == goal:
+            if longest is None or depth > longest:
+                longest = depth
+            continue
+        for new_hash, x2, y2, _ in next_rooms(md5_hash, x, y):
+            stack.append((new_hash, x2, y2, depth + 1))
+    return longest
+
+def explore(passcode):
+    '''
+    Same answers as solve, without the A* frontier or keeping every path.
+    '''
+    shortest = shortest_path(passcode)
+    if shortest is None:
+        return 'Fail'
+    return shortest, longest_path_length(passcode)
+
 
-def moves_func(state, grid_size=4):
+def explore_subtree(passcode, path, position):
     '''
-    First four chars of hash represent UP DOWN LEFT RIGHT.
-    If char is b, c, d, e, f AND fits within the walls (represented by 4x4 grid), door is open.
+    Worker for parallel_explore. md5 objects can't be pickled, so a subtree is sent as the
+    path to its root and the root position, and the hash of passcode + path is rebuilt here.
+    Returns (shortest path to the vault, longest path length), either None if there isn't one.
     '''
-    open_door_digits = 'bcdef'
-    directions = (('U', (0, -1)), ('D', (0, 1)), ('L', (-1, 0)), ('R', (1, 0)))
+    return shortest_path(passcode, path, position), longest_path_length(passcode, path, position)
 
-    new_data_hash = find_md5_hash(state.data_hash)
+def split_tree(passcode, split_depth, goal=(3, 3)):
+    '''
+    Breadth first split_depth steps from the start.
+    Returns (paths which reached the vault on the way, [(path, position)] subtree roots at split_depth).
+    '''
+    goals = []
+    level = [(hashlib.md5(passcode.encode('utf-8')), 0, 0, b'')]
+    for _ in range(split_depth):
+        next_level = []
+        for md5_hash, x, y, path in level:
+            for new_hash, x2, y2, step in next_rooms(md5_hash, x, y):
+                if (x2, y2) == goal:
+                    goals.append((path + step).decode('utf-8'))
+                else:
+                    next_level.append((new_hash, x2, y2, path + step))
+        level = next_level
+    return goals, [(path.decode('utf-8'), (x, y)) for _, x, y, path in level]
+
+def parallel_explore(passcode, split_depth=4, workers=None):
+    '''
+    Same answers as explore, with each subtree at split_depth searched in a worker process.
+    Workers only send back their shortest path and longest length, which are reduced here.
+    (A deeper split gives more, smaller subtrees to share out.)
+    '''
+    workers = workers or os.cpu_count() or 1
+    goals, roots = split_tree(passcode, split_depth)
+    paths = [path for path, _ in roots]
+    positions = [position for _, position in roots]
+
+    if workers == 1:
+        results = list(map(explore_subtree, repeat(passcode), paths, positions))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(explore_subtree, repeat(passcode), paths, positions))
+
+    shortest = [path for path, _ in results if path is not None] + goals
+    longest = [length for _, length in results if length is not None] + [len(path) for path in goals]
+    if not shortest:
+        return 'Fail'
+    return min(shortest, key=len), max(longest)
 
-    for idx, digit in enumerate(new_data_hash):
-        # x, y = state.position
-        # dx, dy = directions[idx][1]
-        # new_position = (x + dx, y + dy)
-        new_position = tuple((sum(x) for x in zip(state.position, directions[idx][1])))
-        if digit in open_door_digits and all(0 <= x < grid_size for x in new_position):
-            yield State(new_position, state.data_hash + directions[idx][0])
+def explore_batch(passcodes, workers=None):
+    '''
+    explore for many passcodes, shared out across workers processes.
+    Returns the results in the same order as passcodes.
+    '''
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return list(map(explore, passcodes))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(explore, passcodes))
 
-def h_func(state, goal=(3, 3)):
-    return sum(abs(x - y) for x, y in zip(state.position, goal))
 
+State = namedtuple('State', ['position', 'path'])
 
-State = namedtuple('State', ['position', 'data_hash'])
+if __name__ == '__main__':
+    # print(solve('pxxbnzuo')) # ~ 0.75 secs, explore ~ 0.1 secs
+    print(explore('hijkl'), 'Fail')
+    print(explore('ihgpwlah'), 'DDRRRD', 370)
+    print(explore('kglvqrro'), 'DDUDRLRRUDRD', 492)
+    print(explore('ulqzkmiv'), 'DRURDRUDDLLDLUURRDULRLDUUDDDRR', 830)
+    print(explore('pxxbnzuo'), 'RDULRDDRRD', 752)
 
-print(astar_search(State((0, 0), 'hijkl'), h_func, moves_func), 'Fail')
-print(astar_search(State((0, 0), 'ihgpwlah'), h_func, moves_func), 'DDRRRD', 370)
-print(astar_search(State((0, 0), 'kglvqrro'), h_func, moves_func), 'DDUDRLRRUDRD', 492)
-print(astar_search(State((0, 0), 'ulqzkmiv'), h_func, moves_func), 'DRURDRUDDLLDLUURRDULRLDUUDDDRR', 830)
-print(astar_search(State((0, 0), 'pxxbnzuo'), h_func, moves_func), 'RDULRDDRRD', 752)
+    print(parallel_explore('pxxbnzuo', split_depth=4), 'RDULRDDRRD', 752)
+    print(explore_batch(['hijkl', 'ihgpwlah', 'kglvqrro', 'ulqzkmiv', 'pxxbnzuo']))
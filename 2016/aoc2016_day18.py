@@ -2,7 +2,7 @@
 Advent of Code - 2016 - Day 18
 http://adventofcode.com/2016
 
-Last Updated: 2017-Feb-25
+Last Updated: 2026-Oct-18
 First Created: 2017-Feb-25
 Python 3.5
 Chris
@@ -124,5 +124,73 @@ def test():
     grid = append_rows(grid, cols=10, rows=10)
     print(count_safe_tiles(grid))
 
-test()
-q1()
+def row_to_int(row):
+    '''
+    '.^^.^' -> 0b01101, a trap is a 1 bit, the first tile is the highest bit.
+    '''
+    return int(''.join('1' if tile == '^' else '0' for tile in row), 2)
+
+def trap_rows(first_row, cols):
+    '''
+    Generator. Yields each row as an int, starting with first_row.
+    The four trap rules come down to left XOR right (centre doesn't matter), so the next row is
+    each tile's left neighbour (row << 1) xor its right neighbour (row >> 1). The walls are safe,
+    which the shifts give us for free, and the mask drops the bit shifted off the left.
+    '''
+    mask = (1 << cols) - 1
+    row = first_row
+    while True:
+        yield row
+        row = ((row << 1) ^ (row >> 1)) & mask
+
+def count_safe(first_row, rows):
+    '''
+    Number of safe tiles in the first rows rows. first_row is a string like '.^^.^'.
+    Only the current row is kept.
+    '''
+    cols = len(first_row)
+    traps = 0
+    for _, row in zip(range(rows), trap_rows(row_to_int(first_row), cols)):
+        traps += bin(row).count('1')
+    return rows * cols - traps
+
+def count_safe_cyclic(first_row, rows, max_remembered=10 ** 6):
+    '''
+    count_safe for any number of rows (e.g 10 ** 15), as long as the rows start repeating soon enough.
+
+    Each row only depends on the one before, so once a row comes round again the rows cycle
+    from then on. Every row is remembered (row int -> first index) along with the running
+    total of traps, so at the first repeat the total for any number of rows is the rows
+    before the cycle + whole cycles + part of a cycle.
+
+    The cycle can be very long. With null walls, a row of n tiles acts like a ring of
+    2(n + 1), and for n = 100 the cycle length divides 2 * (2 ** 50 - 1), so puzzle width
+    rows are out of reach. Narrow rows cycle quickly (e.g 10 tiles, 62 rows).
+    Raises ValueError if no row repeats within max_remembered rows.
+    '''
+    cols = len(first_row)
+    seen = {}
+    traps_before = [0] # traps_before[i] is the number of traps in the first i rows
+    for idx, row in enumerate(trap_rows(row_to_int(first_row), cols)):
+        if idx == rows:
+            return rows * cols - traps_before[rows]
+        if row in seen:
+            start = seen[row]
+            period = idx - start
+            cycles, extra = divmod(rows - start, period)
+            cycle_traps = traps_before[idx] - traps_before[start]
+            traps = traps_before[start] + cycles * cycle_traps + traps_before[start + extra] - traps_before[start]
+            return rows * cols - traps
+        if idx == max_remembered:
+            raise ValueError('No repeated row in the first {} rows'.format(max_remembered))
+        seen[row] = idx
+        traps_before.append(traps_before[-1] + bin(row).count('1'))
+
+# test()
+# q1()
+first_row = ''.join(get_input()).strip()
+print(count_safe('.^^.^.^^^^', 10), 38)
+print(count_safe(first_row, 40), 1982)
+print(count_safe(first_row, 400000), 20005203)
+print(count_safe_cyclic(first_row[:10], 10 ** 15), count_safe_cyclic(first_row[:10], 10 ** 5) == count_safe(first_row[:10], 10 ** 5))
+# count_safe_cyclic(first_row, 10 ** 15) # ValueError, the full width rows don't repeat for ~10 ** 15 rows
@@ -3,7 +3,7 @@
 Advent of Code - 2016 - Day 22
 http://adventofcode.com/2016
 
-Last Updated: 2017-Apr-18
+Last Updated: 2026-Oct-18
 First Created: 2017-Mar-13
 Python 3.5
 Chris
@@ -129,8 +129,11 @@ Both parts of this puzzle are complete! They provide two gold stars: **
 import re
 from collections import namedtuple
 import copy
-import heapq
 import csv
+from functools import partial
+
+from aoc2016_grid import Grid
+from aoc2016_search import astar_search, bidirectional_search, path_length
 
 def get_data_part_one(filename='aoc2016_day22.txt'):
     Node_Data = namedtuple('Node_Data', ['x', 'y', 'size', 'used', 'avail', 'use_pct'])
@@ -174,7 +177,8 @@ def part_one(nodes):
 def part_two(nodes):
     """
     Two parts to this solution.
-    1: Move from starting position to position directly left of the very top-right (using Astar).
+    1: Move from starting position to position directly left of the very top-right
+       (using a bidirectional breadth first search, the grid is unit cost and undirected - Astar also works).
     2: Similar to a 15-puzzle, then repeat the same set of moves until moved to finishing position at top-left.
 
     (e.g we are at P, and T is our target - this is the set of five moves we can use repeatedly)
@@ -184,23 +188,40 @@ def part_two(nodes):
 
     """
 
-    start_x, start_y = next(((node.x, node.y) for node in nodes if node.use_pct == 0), None)
-    start_state = State(start_x, start_y)
-
-    top_right_node = max(nodes, key=lambda k: k.x)
-    goal_state = State(top_right_node.x - 1, 0) # we want the location to the left of the top-right, and y=0
+    start_state, goal_state = start_and_goal(nodes)
 
-    node_grid = {(node.x, node.y): 1 if node.use_pct < 90 else 0 for node in nodes}
+    # node grid as rows (y) by columns (x), a node is passable if use_pct < 90
+    node_grid = Grid(max(node.y for node in nodes) + 1, goal_state.x + 2)
+    for node in nodes:
+        node_grid.set_open(node.y, node.x, node.use_pct < 90)
 
-    moves = astar_search(start_state, h_func, moves_func, node_grid, goal_state)
+    moves = bidirectional_search(node_grid.index(start_state.y, start_state.x), node_grid.index(goal_state.y, goal_state.x),
+                                 node_grid.neighbours, length_only=True)
 
-    moves_1 = len(moves) - 1 # minus one as we don't need to include start position in number of moves
+    moves_1 = moves - 1 # minus one as we don't need to include start position in number of moves
     moves_2 = (goal_state.x * 5) + 1 # add one as we'll be at 0,0 and our target is at 1,0, so need to move the target to 0,0
 
     return moves_1 + moves_2
 
-def Path(previous, state):
-    return ([] if state is None else Path(previous, previous[state]) + [state])
+def part_two_astar(nodes):
+    """
+    part_two as it was, with Astar on a dict of (x, y) -> passable for the first part.
+    """
+    start_state, goal_state = start_and_goal(nodes)
+
+    node_grid = {(node.x, node.y): 1 if node.use_pct < 90 else 0 for node in nodes}
+    moves = astar_search(start_state, partial(h_func, goal_state=goal_state), partial(moves_func, nodes=node_grid),
+                         reconstruct=path_length)
+
+    return (moves - 1) + (goal_state.x * 5) + 1
+
+def start_and_goal(nodes):
+    """
+    The empty node we start from, and the location to the left of the very top-right (y=0).
+    """
+    start_state = next((State(node.x, node.y) for node in nodes if node.use_pct == 0), None)
+    top_right_node = max(nodes, key=lambda k: k.x)
+    return start_state, State(top_right_node.x - 1, 0)
 
 def h_func(state, goal_state):
     return abs(state.x - goal_state.x) + abs(state.y - goal_state.y)
@@ -216,22 +237,6 @@ def moves_func(state, nodes):
         if nodes.get((nebor_x, nebor_y), None):
             yield State(nebor_x, nebor_y)
 
-def astar_search(start, h_func, moves_func, nodes, goal_state):
-    frontier = [(h_func(start, goal_state), start)]
-    previous = {start: None}
-    path_cost = {start: 0}
-
-    while frontier:
-        (f, s) = heapq.heappop(frontier)
-        if h_func(s, goal_state) == 0:
-            return Path(previous, s)
-        for s2 in moves_func(s, nodes):
-            new_cost = path_cost[s] + 1
-            if s2 not in path_cost or new_cost < path_cost[s2]:
-                heapq.heappush(frontier, (h_func(s2, goal_state) + new_cost, s2))
-                previous[s2] = s
-                path_cost[s2] = new_cost
-
 def write_to_grid(nodes):
     """ Create a visual representation of grid in csv file """
 
@@ -266,3 +271,6 @@ State = namedtuple('State', ['x', 'y'])
 
 ans2 = part_two(nodes)
 print(ans2, ans2 == 246)
+
+# ans2 = part_two_astar(nodes)
+# print(ans2, ans2 == 246)
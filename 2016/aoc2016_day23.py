@@ -3,7 +3,7 @@
 Advent of Code - 2016 - Day 23
 http://adventofcode.com/2016
 
-Last Updated: 2017-Apr-12
+Last Updated: 2026-Oct-18
 First Created: 2017-Apr-07
 Python 3.6
 Chris
@@ -84,6 +84,8 @@ Both parts of this puzzle are complete! They provide two gold stars: **
 
 import time
 
+from aoc2016_assembunny import Machine, Trace
+
 def is_int(s):
     try:
         int(s)
@@ -178,10 +180,23 @@ def day23(commands, vals):
 part_one = {'a': 7, 'b': 0, 'c': 0, 'd': 0}
 part_two = {'a': 12, 'b': 0, 'c': 0, 'd': 0}
 
-commands = get_data('aoc2016_day23.txt')
-ans_part_one = day23(commands, part_one)
-commands = get_data('aoc2016_day23.txt')
-ans_part_two = day23(commands, part_two)
+# original interpreter, prints every step and writes aoc2016_day23_debug.txt
+# ans_part_one = day23(get_data('aoc2016_day23.txt'), part_one)
 
+DEBUG = False # trace part one and write aoc2016_day23_debug.txt
+
+commands = get_data('aoc2016_day23.txt')
+print(Machine(get_data('aoc2016_day23_test.txt')).run()['a'], 3)
+if DEBUG:
+    trace = Trace(size=1000, sample_every=1)
+    ans_part_one = Machine(commands, part_one, trace=trace).run()
+    print(trace.report())
+    trace.write('aoc2016_day23_debug.txt')
+else:
+    ans_part_one = Machine(commands, part_one).run()
 print('\n', ans_part_one, ans_part_one['a'] == 14160)
-print('\n', ans_part_two, ans_part_two['a'] == 479010720)
+
+# part two is 12! + 96 * 95, billions of instructions without loop fusion (hours, optimize=False)
+machine = Machine(commands, part_two)
+ans_part_two = machine.run()
+print('\n', ans_part_two, ans_part_two['a'] == 479010720, '{} instructions'.format(machine.steps))
@@ -3,7 +3,7 @@
 Advent of Code - 2016 - Day 24
 http://adventofcode.com/2016
 
-Last Updated: 2017-Apr-12
+Last Updated: 2026-Oct-18
 First Created: 2017-Apr-10
 Python 3.6
 Chris
@@ -55,8 +55,11 @@ Both parts of this puzzle are complete! They provide two gold stars: **
 
 '''
 
-import heapq
 from collections import namedtuple
+from functools import partial
+
+from aoc2016_grid import Grid
+from aoc2016_search import SearchStats, astar_search, path_length
 
 def get_data(filename):
     conversion = {'#': 0, '.': 1}
@@ -77,7 +80,7 @@ def moves_func(state, grid):
             }
     for x, y in moves:
         if grid[x][y]:
-            if (x, y) in goal_locations.values():
+            if grid[x][y] in goal_locations: # labels are the only str cells
                 new_goal_locations = goal_locations.copy()
                 new_goal_locations.pop(grid[x][y])
                 yield(State(x, y, frozenset(new_goal_locations.items())))
@@ -97,46 +100,128 @@ def h_func_part_two(state):
                             + (abs(state.x - start_x) + abs(state.y - start_y))
     return estimated_distance
 
-def Path(previous, state):
-    return ([] if state is None else Path(previous, previous[state]) + [state])
-
-def astar_search(start, h_func, moves_func, grid):
-    frontier = [(h_func(start), start)]
-    previous = {start: None}
-    path_cost = {start: 0}
-
-    answers = []
-
-    while frontier:
-        (f, s) = heapq.heappop(frontier)
-        print('Distance to goal: {}'.format(h_func(s)))
-        if h_func(s) == 0:
-            answers.append(Path(previous, s))
-        else:
-            for s2 in moves_func(s, grid):
-                new_cost = path_cost[s] + 1
-                if s2 not in path_cost or new_cost < path_cost[s2]:
-                    heapq.heappush(frontier, (h_func(s2) + new_cost, s2))
-                    previous[s2] = s
-                    path_cost[s2] = new_cost
-
-    return answers # 'No path found'
-
+def distance_matrix(grid):
+    '''
+    One breadth first sweep (Grid.distances) from each numbered location gives the shortest
+    distance between every pair of them, so the maze is only searched n times rather than
+    once per goal subset.
+    Returns (labels, matrix), matrix[i][j] is the distance from labels[i] to labels[j]
+    (None if there's no way through).
+    '''
+    labels = sorted(grid.labels, key=int)
+    matrix = []
+    for label in labels:
+        dist = grid.distances(grid.labels[label])
+        matrix.append([dist[grid.labels[other]] if dist[grid.labels[other]] >= 0 else None for other in labels])
+    return labels, matrix
+
+def held_karp(matrix, start=0, return_to_start=False):
+    '''
+    Shortest route from start visiting every location, by dynamic programming over subsets.
+    best[visited][last] is the shortest route from start which visits the locations in the
+    bitmask visited, ending at last. Each subset only extends smaller ones, so counting up
+    through the bitmasks fills the table in order. O(2^n * n^2), fine for 15+ locations.
+
+    Returns (distance, order of location indexes), or (None, None) if some can't be reached.
+    '''
+    n = len(matrix)
+    full = (1 << n) - 1
+    best = [[None] * n for _ in range(1 << n)]
+    previous = [[None] * n for _ in range(1 << n)]
+    best[1 << start][start] = 0
+
+    for visited in range(1 << n):
+        costs = best[visited]
+        for last in range(n):
+            cost = costs[last]
+            if cost is None:
+                continue
+            row = matrix[last]
+            for nxt in range(n):
+                bit = 1 << nxt
+                if visited & bit or row[nxt] is None:
+                    continue
+                new_cost = cost + row[nxt]
+                old_cost = best[visited | bit][nxt]
+                if old_cost is None or new_cost < old_cost:
+                    best[visited | bit][nxt] = new_cost
+                    previous[visited | bit][nxt] = last
+
+    ends = []
+    for last in range(n):
+        cost = best[full][last]
+        if cost is None:
+            continue
+        if return_to_start:
+            if matrix[last][start] is None:
+                continue
+            cost += matrix[last][start]
+        ends.append((cost, last))
+    if not ends:
+        return None, None
+
+    distance, last = min(ends)
+    order = []
+    visited = full
+    while last is not None:
+        order.append(last)
+        last, visited = previous[visited][last], visited ^ (1 << last)
+    order.reverse()
+    if return_to_start:
+        order.append(start)
+    return distance, order
+
+def solve(filename='aoc2016_day24.txt'):
+    with open(filename) as f:
+        grid = Grid.from_text(f)
+    labels, matrix = distance_matrix(grid)
+    start = labels.index('0')
+    ans1, order1 = held_karp(matrix, start)
+    ans2, order2 = held_karp(matrix, start, return_to_start=True)
+    print(ans1, ''.join(labels[x] for x in order1))
+    print(ans2, ''.join(labels[x] for x in order2))
+    return ans1, ans2
+
+def check_csv(filename='aoc2016_day24.txt', csv_filename='aoc2016_day24_maze.csv'):
+    '''
+    Grid.from_csv on the maze csv gives the same cells and labels as Grid.from_text on the puzzle input.
+    '''
+    with open(filename) as f:
+        grid = Grid.from_text(f)
+    csv_grid = Grid.from_csv(csv_filename)
+    return csv_grid.cells == grid.cells and csv_grid.labels == grid.labels
+
+def solve_astar(filename='aoc2016_day24.txt'):
+    '''
+    Original search: the goals left to visit are part of the state, so the grid is searched
+    again for every subset of them.
+    '''
+    global start_x, start_y
+    grid, goal_locations = get_data(filename)
+    start_x, start_y = goal_locations.pop('0')
+
+    # can freeze dict for hashing purposes, then unfreeze when need to access the data,
+    # then refreeze for hashing purposes, and so on.
+    start_state = State(start_x, start_y, frozenset(goal_locations.items()))
+
+    stats = SearchStats()
+    ans1 = astar_search(start_state, h_func, partial(moves_func, grid=grid), all_goals=True, stats=stats,
+                        reconstruct=path_length)
+    ans1_len = min(ans1) - 1 # remove starting square
+    print(stats)
+
+    stats = SearchStats()
+    ans2 = astar_search(start_state, h_func_part_two, partial(moves_func, grid=grid), all_goals=True, stats=stats,
+                        reconstruct=path_length)
+    ans2_len = min(ans2) - 1 # remove starting square
+    print(stats)
+    return ans1_len, ans2_len
 
-# grid, goal_locations = get_data(filename='aoc2016_day24_test.txt')
-grid, goal_locations = get_data('aoc2016_day24.txt')
 State = namedtuple('State', ['x', 'y', 'goal_locations'])
-start_x, start_y = goal_locations.pop('0')
-
-# can freeze dict for hashing purposes, then unfreeze when need to access the data,
-# then refreeze for hashing purposes, and so on.
-start_state = State(start_x, start_y, frozenset(goal_locations.items()))
-
-ans1 = astar_search(start_state, h_func, moves_func, grid)
-ans1_len = len(min(ans1, key=len)) - 1 # remove starting square
-
-ans2 = astar_search(start_state, h_func_part_two, moves_func, grid)
-ans2_len = len(min(ans2, key=len)) - 1 # remove starting square
 
-print(ans1_len, ans1_len == 490)
-print(ans2_len, ans2_len == 744)
+# ans1, ans2 = solve_astar() # ~ 31 secs
+# print(solve('aoc2016_day24_test.txt'), 14)
+ans1, ans2 = solve()
+print(ans1, ans1 == 490)
+print(ans2, ans2 == 744)
+print(check_csv(), True)
@@ -3,7 +3,7 @@
 Advent of Code - 2016 - Day 25
 http://adventofcode.com/2016
 
-Last Updated: 2017-Apr-18
+Last Updated: 2026-Oct-18
 First Created: 2017-Apr-11
 Python 3.6
 Chris
@@ -72,6 +72,9 @@ I've highlighted the easter eggs in each puzzle, just in case you missed any. Ho
 
 import time
 
+from aoc2016_assembunny import Machine
+from aoc2016_pool import chunked_map
+
 def get_data(filename='aoc2016_day25.txt'):
     commands = []
     with open(filename) as f:
@@ -160,5 +163,67 @@ def part_one():
     print('attempt success:', attempt, repeat_count)
 
 
-commands = get_data()
-part_one()
+def is_clock(commands, a, length=100):
+    '''
+    True if the program sends 0, 1, 0, 1... for (at least) the first length outputs.
+    Each attempt runs on its own Machine, so nothing carries over between attempts.
+    '''
+    sent = 0
+    for value in Machine(commands, {'a': a}).execute():
+        if value != sent % 2:
+            return False
+        sent += 1
+        if sent == length:
+            return True
+    return False # program stopped
+
+def clock_period(commands, a, max_outputs=10000):
+    '''
+    Proves the program sends 0, 1, 0, 1... forever, rather than checking the first 100.
+    The machine state (pc, registers, program version) is saved after each out. Once a state
+    comes round again, everything from then on repeats what was sent since it was last seen.
+    So if the outputs so far alternate from 0, and the repeat is an even number of outputs
+    long, they alternate forever.
+    Returns that period, or None if the outputs don't alternate, the program stops, or no state
+    repeats within max_outputs.
+    '''
+    machine = Machine(commands, {'a': a})
+    seen = {} # state after out -> number of outputs sent by then
+    sent = 0
+    for value in machine.execute():
+        if value != sent % 2:
+            return None
+        sent += 1
+        state = machine.snapshot()
+        if state in seen:
+            period = sent - seen[state]
+            return period if period % 2 == 0 else None
+        if sent == max_outputs:
+            return None
+        seen[state] = sent
+    return None
+
+def clock_chunk(commands, max_outputs, lo, hi):
+    '''
+    Worker for find_clock, the values of a in [lo, hi) which give a clock signal.
+    '''
+    return [a for a in range(lo, hi) if clock_period(commands, a, max_outputs)]
+
+def find_clock(commands, workers=None, chunk_size=50, max_outputs=10000):
+    '''
+    Lowest a which gives a clock signal. Blocks of chunk_size values of a are tried across
+    workers processes, each with its own copy of the program. Searches until it finds one.
+    '''
+    for hits in chunked_map(clock_chunk, (commands, max_outputs), chunk_size, workers):
+        if hits:
+            return hits[0]
+
+def part_one_vm(commands, max_attempt=10000):
+    return next((a for a in range(max_attempt) if is_clock(commands, a)), None)
+
+if __name__ == '__main__':
+    commands = get_data()
+    # part_one()
+    # ans = part_one_vm(commands)
+    ans = find_clock(commands)
+    print(ans, ans == 158, 'period {}'.format(clock_period(commands, ans)))
@@ -3,7 +3,7 @@
 Advent of Code - 2016 - Day 5
 http://adventofcode.com/2016
 
-Last Updated: 2017-Jan-07
+Last Updated: 2026-Oct-18
 First Created: 2017-Jan-06
 Python 3.5
 Chris
@@ -53,17 +53,21 @@ from itertools import count
 from itertools import islice
 import timeit
 
+from aoc2016_md5 import PrefixHasher, leading_zeros, mine_hashes
+
 
 def get_next_digit(puzzle_input):
     '''
     Generator. Yields the md5 hash of puzzle_input + ascending number, where the first
     five digits are '00000'.
-    (Using [0:5] is supposedly quicker than 'startswith')
+    puzzle_input is only hashed once, and the zeros are checked on the raw digest bytes
+    so we only build the hex string for hits.
     '''
+    hasher = PrefixHasher(puzzle_input)
     for x in count():
-        md5_hash = hashlib.md5('{}{}'.format(puzzle_input, x).encode('utf-8')).hexdigest()
-        if md5_hash[0:5] == '00000':
-            yield md5_hash
+        digest = hasher.digest(x)
+        if leading_zeros(digest, 5):
+            yield digest.hex()
 
 def get_door_id_basic(puzzle_input, password_length):
     '''
@@ -73,20 +77,23 @@ def get_door_id_basic(puzzle_input, password_length):
     answers = [next(digits)[5] for _ in range(password_length)]
     return ''.join(answers)
 
-def get_door_id_slice(puzzle_input, password_length):
+def get_door_id_slice(puzzle_input, password_length, workers=None):
     '''
     Using itertools islice, slightly quicker.
+    Hashes are mined across workers processes (None = one per core), hits come back in index order.
     '''
-    hashes = islice(get_next_digit(puzzle_input), password_length)
-    return ''.join([x[5] for x in hashes]) # only need 6th digit.
+    hashes = islice(mine_hashes(puzzle_input, workers=workers), password_length)
+    return ''.join([x[5] for _, x in hashes]) # only need 6th digit.
 
-def get_door_id_2(puzzle_input, password_length):
+def get_door_id_2(puzzle_input, password_length, workers=None):
     '''
     Part 2. Get md5 hash starting with '00000'. 6th digit is index of answer,
     if it's an integer, and if that index hasn't already been used.
     7th digit is the answer.
+    Hashes are mined across workers processes (None = one per core), hits come back in index order
+    so the first hit for each position still wins.
     '''
-    hashes = iter(get_next_digit(puzzle_input)) # use iter so generator remembers it's position and doesn't start again from start.
+    hashes = (x for _, x in mine_hashes(puzzle_input, workers=workers)) # generator remembers it's position and doesn't start again from start.
     answers = ['' for _ in range(password_length)]
     while any([x == '' for x in answers]):
         print(answers)
@@ -108,26 +115,29 @@ def get_door_id_old(puzzle_input, password_length):
         if len(answers) == password_length:
             return ''.join(answers)
 
-def run_and_time(funk, details):
+def run_and_time(funk, details, **kwargs):
     '''
     Run and time a funk (function) using details (tuple).
+    Any kwargs (e.g workers=4) are passed on to funk.
     '''
     test_input, password_length, answer = details
     start = timeit.default_timer()
-    print(funk(test_input, password_length), answer)
+    print(funk(test_input, password_length, **kwargs), answer)
     stop = timeit.default_timer()
     print('Running time for {}: {:.4f}'.format(funk.__name__, stop - start))
 
 
-test1 = ('abc', 8, '18f47a30')
-ans1 = ('reyedfim', 8, 'f97c354d')
+if __name__ == '__main__': # mine_hashes starts worker processes, which import this file
+    test1 = ('abc', 8, '18f47a30')
+    ans1 = ('reyedfim', 8, 'f97c354d')
 
-test2 = ('abc', 8, '05ace8e3')
-ans2 = ('reyedfim', 8, '863dde27')
+    test2 = ('abc', 8, '05ace8e3')
+    ans2 = ('reyedfim', 8, '863dde27')
 
-# run_and_time(get_door_id_basic, test1) # ~ 48.5 secs
-# run_and_time(get_door_id_old, test1) # ~ 53.3 secs
-# run_and_time(get_door_id_slice, test1) # ~ 47.5 secs
+    # run_and_time(get_door_id_basic, test1) # ~ 14.1 secs
+    # run_and_time(get_door_id_old, test1) # ~ 53.3 secs
+    # run_and_time(get_door_id_slice, test1) # ~ 10.5 secs on one core, less with more (one process per core)
+    # run_and_time(get_door_id_slice, test1, workers=1) # ~ 10.5 secs
 
-# run_and_time(get_door_id_2, test2) # ~ 67.8 secs
-# run_and_time(get_door_id_2, ans2) # ~ 126.2 secs
+    # run_and_time(get_door_id_2, test2) # ~ 11.1 secs on one core
+    # run_and_time(get_door_id_2, ans2) # ~ 23.2 secs on one core
@@ -3,7 +3,7 @@
 Advent of Code - 2016 - Day 9
 http://adventofcode.com/2016
 
-Last Updated: 2017-Feb-02
+Last Updated: 2026-Oct-18
 First Created: 2017-Jan-08
 Python 3.5
 Chris
@@ -103,7 +103,83 @@ def problem_two(data):
 
     return len(ans)
 
+MARKER = re.compile(rb'[(](\d+)x(\d+)[)]')
+
+def decompress_chunks(data, version=2, chunk_size=1 << 16):
+    '''
+    Generator. Yields the decompressed data (as bytes) chunk_size at a time, the last chunk may be shorter.
+
+    Works through the data with a stack of the sections being repeated, each
+    [position, section start, section end, repeats left, whether markers count inside it].
+    Plain runs are copied straight from a memoryview into the chunk buffer, and never more
+    than the buffer has room for, so memory is one chunk plus one frame per level of nesting.
+    A section with no markers in it is copied as many whole times as fit in one go.
+    '''
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    data = data.translate(None, b' \t\r\n') # "whitespace is ignored"
+    view = memoryview(data)
+    buffer = bytearray()
+    stack = [[0, 0, len(data), 1, True]]
+    while stack:
+        frame = stack[-1]
+        pos, start, end, repeats, markers = frame
+        if pos >= end:
+            if repeats > 1: # go round the section again
+                frame[0] = start
+                frame[3] -= 1
+            else:
+                stack.pop()
+            continue
+
+        marker = MARKER.match(view, pos, end) if markers else None
+        if marker:
+            chars, repeat = int(marker.group(1)), int(marker.group(2))
+            section_start = marker.end()
+            section_end = min(section_start + chars, end)
+            frame[0] = section_end # carry on after the section once it's done
+            if repeat and section_end > section_start:
+                has_markers = version == 2 and data.find(b'(', section_start, section_end) != -1
+                stack.append([section_start, section_start, section_end, repeat, has_markers])
+            continue
+
+        if not markers and pos == start:
+            copies = min(repeats, (chunk_size - len(buffer)) // (end - start))
+            if copies > 1:
+                buffer += bytes(view[start:end]) * copies
+                frame[3] -= copies
+                if not frame[3]:
+                    stack.pop()
+                if len(buffer) == chunk_size:
+                    yield bytes(buffer)
+                    buffer.clear()
+                continue
+
+        run_end = data.find(b'(', pos + 1, end) if markers else -1
+        if run_end == -1:
+            run_end = end
+        run_end = min(run_end, pos + chunk_size - len(buffer))
+        buffer += view[pos:run_end]
+        frame[0] = run_end
+        if len(buffer) == chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+def decompress_to_file(data, f, version=2, chunk_size=1 << 16):
+    '''
+    Write the decompressed data to f (opened in binary mode), chunk_size bytes at a time.
+    Returns the number of bytes written.
+    '''
+    written = 0
+    for chunk in decompress_chunks(data, version, chunk_size):
+        f.write(chunk)
+        written += len(chunk)
+    return written
+
 ### norvig
+cat = ''.join
 matcher = re.compile(r'[(](\d+)x(\d+)[)]').match # e.g. matches "(2x5)" as ('2', '5')
 def decompress_length(s):
     """Decompress string s by interpreting '(2x5)' as making 5 copies of the next 2 characters.
@@ -165,4 +241,15 @@ def do_two():
     # result = problem_two(data)
     # print(result)
 
+def streaming():
+    examples = ['(3x3)XYZ', 'X(8x2)(3x3)ABCY', '(25x3)(3x3)ABC(2x3)XY(5x2)PQRSTX(18x9)(3x2)TWO(5x7)SEVEN']
+    print([b''.join(decompress_chunks(item, chunk_size=4)).decode() for item in examples[:2]], ['XYZXYZXYZ', 'XABCABCABCABCABCABCY'])
+    print(sum(len(chunk) for chunk in decompress_chunks(examples[2], chunk_size=7)), 445)
+
+    data = get_data()
+    print(len(b''.join(decompress_chunks(data, version=1))), 120765)
+    # with open('aoc2016_day9_v2.txt', 'wb') as f:
+    #     print(decompress_to_file(data, f)) # 11658395076 bytes (~11 GB, ~9 mins)
+
 do_one()
+streaming()
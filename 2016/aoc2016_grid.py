@@ -0,0 +1,119 @@
+'''
+Advent of Code - 2016 - Grid helpers
+http://adventofcode.com/2016
+
+Last Updated: 2026-Oct-18
+First Created: 2026-Oct-18
+Python 3.5
+Chris
+
+A flat grid of open / wall cells for the maze days (Day 22, Day 24).
+
+Cells are one byte each in a bytearray (1 = open, 0 = wall), row after row, with an extra
+ring of wall around the outside. A cell is just an int index into that bytearray, and its
+neighbours are index +/- 1 and index +/- stride, so neighbour tests are byte lookups with
+no bounds checks and no (x, y) tuples. index() / coords() convert to and from (row, col).
+
+Labels (the numbered locations in Day 24) are kept separately, label -> index.
+
+'''
+
+from array import array
+import csv
+import re
+
+
+class Grid():
+    '''
+    height rows by width columns, all walls to start with (see set_open, from_text, from_csv).
+    '''
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.stride = width + 2 # row length including the wall either side
+        self.cells = bytearray(self.stride * (height + 2))
+        self.offsets = (1, -1, self.stride, -self.stride)
+        self.labels = {}
+
+    @classmethod
+    def from_text(cls, lines, wall='#', space='.'):
+        '''
+        One row per line, wall characters are walls, anything else is open.
+        Characters other than wall and space are labels, e.g the numbers in Day 24.
+        '''
+        lines = [line.rstrip('\n') for line in lines]
+        lines = [line for line in lines if line]
+        grid = cls(len(lines), max(len(line) for line in lines))
+        to_cells = bytes(b != ord(wall) for b in range(256)) # translate table, wall -> 0, anything else -> 1
+        label_chars = re.compile('[^{}{}]'.format(re.escape(wall), re.escape(space)))
+        for row, line in enumerate(lines):
+            start = grid.index(row, 0)
+            row_cells = line.encode().translate(to_cells)
+            grid.cells[start:start + len(row_cells)] = row_cells
+            for match in label_chars.finditer(line):
+                grid.labels[match.group()] = start + match.start()
+        return grid
+
+    @classmethod
+    def from_csv(cls, filename, wall='0', space='1', label='L'):
+        '''
+        Same as from_text, for a csv file with one cell per column (e.g aoc2016_day24_maze.csv).
+        Labels have their own encoding, label then the name (e.g L0), so a label can't be
+        mistaken for a wall or open cell. Any other value raises ValueError.
+        '''
+        with open(filename, newline='') as f:
+            rows = [row for row in csv.reader(f) if row]
+        grid = cls(len(rows), max(len(row) for row in rows))
+        for row, values in enumerate(rows):
+            start = grid.index(row, 0)
+            grid.cells[start:start + len(values)] = bytes(value != wall for value in values)
+            for col, value in enumerate(values):
+                if value.startswith(label):
+                    grid.labels[value[len(label):]] = start + col
+                elif value not in (wall, space):
+                    raise ValueError('unknown cell {!r} at row {}, col {}'.format(value, row, col))
+        return grid
+
+    def index(self, row, col):
+        return (row + 1) * self.stride + col + 1
+
+    def coords(self, index):
+        row, col = divmod(index, self.stride)
+        return row - 1, col - 1
+
+    def is_open(self, index):
+        return self.cells[index] == 1
+
+    def set_open(self, row, col, is_open=True):
+        self.cells[self.index(row, col)] = is_open
+
+    def neighbours(self, index):
+        '''
+        Open cells next to index. Usable as moves_func for the aoc2016_search searches.
+        '''
+        cells = self.cells
+        for offset in self.offsets:
+            if cells[index + offset]:
+                yield index + offset
+
+    def distances(self, start):
+        '''
+        Breadth first sweep from start. Returns an array of the distance to every cell
+        (by index), -1 for walls and cells which can't be reached.
+        '''
+        cells, offsets = self.cells, self.offsets
+        dist = array('i', [-1]) * len(cells)
+        dist[start] = 0
+        frontier = [start]
+        steps = 0
+        while frontier:
+            steps += 1
+            next_frontier = []
+            for idx in frontier:
+                for offset in offsets:
+                    idx2 = idx + offset
+                    if cells[idx2] and dist[idx2] < 0:
+                        dist[idx2] = steps
+                        next_frontier.append(idx2)
+            frontier = next_frontier
+        return dist
@@ -0,0 +1,103 @@
+'''
+Advent of Code - 2016 - MD5 helpers
+http://adventofcode.com/2016
+
+Last Updated: 2026-Oct-18
+First Created: 2026-Oct-18
+Python 3.5
+Chris
+
+Shared code for the MD5 puzzles (Day 5, Day 14, Day 17).
+
+The index space (salt + 0, salt + 1, ...) is split into fixed-size chunks which are
+hashed in a process pool (aoc2016_pool.chunked_map). Results are merged back in chunk
+order, so callers see exactly the same stream as a single threaded itertools.count() loop.
+
+stretched_hashes uses the same chunks to compute key stretched hashes (Day 14) ahead of
+time, and streams the raw digests back in index order.
+
+PrefixHasher hashes the fixed salt once and .copy()s that state for each candidate.
+Leading zeros are tested on the raw digest() bytes, hex is only built for hits.
+
+'''
+
+from binascii import hexlify
+import hashlib
+
+from aoc2016_pool import chunked_map
+
+
+class PrefixHasher():
+    '''
+    md5 of a fixed salt followed by a varying suffix (an int index or a string).
+    The salt is only hashed once, each suffix is added to a copy of that state.
+    '''
+    def __init__(self, salt):
+        self.salt_hash = hashlib.md5(salt.encode('utf-8'))
+
+    def digest(self, suffix):
+        md5_hash = self.salt_hash.copy()
+        md5_hash.update(str(suffix).encode('utf-8'))
+        return md5_hash.digest()
+
+    def hexdigest(self, suffix):
+        return self.digest(suffix).hex()
+
+def leading_zeros(digest, zeros=5):
+    '''
+    True if the hex representation of digest (bytes) starts with zeros '0' characters.
+    Each byte is two hex digits, so check the whole bytes then the top nibble of the next one if zeros is odd.
+    '''
+    whole, half = divmod(zeros, 2)
+    return not any(digest[:whole]) and (not half or digest[whole] < 16)
+
+def hash_chunk(salt, zeros, lo, hi):
+    '''
+    Return a list of (index, hexdigest) for every index in [lo, hi) where the md5 hash of
+    salt + index starts with zeros '0' characters.
+    Hot loop, so leading_zeros is inlined: compare whole zero bytes, then the top nibble of the next byte.
+    '''
+    salt_hash = PrefixHasher(salt).salt_hash
+    whole, half = divmod(zeros, 2)
+    zero_bytes = bytes(whole)
+    hits = []
+    for x in range(lo, hi):
+        md5_hash = salt_hash.copy()
+        md5_hash.update(b'%d' % x)
+        digest = md5_hash.digest()
+        if digest[:whole] == zero_bytes and (not half or digest[whole] < 16):
+            hits.append((x, digest.hex()))
+    return hits
+
+def mine_hashes(salt, zeros=5, workers=None, chunk_size=100000):
+    '''
+    Generator. Yields (index, hexdigest) for each index whose md5 hash of salt + index
+    starts with zeros '0' characters, in ascending index order.
+    '''
+    for hits in chunked_map(hash_chunk, (salt, zeros), chunk_size, workers):
+        yield from hits
+
+def stretch_chunk(salt, stretch, lo, hi):
+    '''
+    Return the list of digests (bytes) for indexes [lo, hi), where each is the md5 hash of
+    salt + index, re-hashed (as lowercase hex) another stretch times.
+    hexlify gives the hex as bytes ready for the next md5, so no str encode/decode in the loop.
+    '''
+    hasher = PrefixHasher(salt)
+    md5 = hashlib.md5
+    hashes = []
+    for x in range(lo, hi):
+        digest = hasher.digest(x)
+        for _ in range(stretch):
+            digest = md5(hexlify(digest)).digest()
+        hashes.append(digest)
+    return hashes
+
+def stretched_hashes(salt, stretch=0, workers=None, chunk_size=1000):
+    '''
+    Generator. Yields the (stretched) digest for index 0, 1, 2, ... in order.
+    Use .hex() on a digest if you need the hex string.
+    Blocks of chunk_size indexes are computed ahead of time across workers processes.
+    '''
+    for hashes in chunked_map(stretch_chunk, (salt, stretch), chunk_size, workers):
+        yield from hashes
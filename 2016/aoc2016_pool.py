@@ -0,0 +1,50 @@
+'''
+Advent of Code - 2016 - Process pool helpers
+http://adventofcode.com/2016
+
+Last Updated: 2026-Oct-18
+First Created: 2026-Oct-18
+Python 3.5
+Chris
+
+Shared code for searching an index space across processes (Day 5, Day 14, Day 25).
+
+The index space (start, start + 1, ...) is split into fixed-size chunks which are run in
+a process pool. Results come back in chunk order, so callers see exactly the same stream
+as a single threaded loop over itertools.count().
+
+'''
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+
+
+def chunked_map(func, args, chunk_size, workers=None, start=0):
+    '''
+    Generator. Calls func(*args, lo, hi) for consecutive chunks [lo, hi) of the index
+    space, starting at start, and yields the results in chunk order.
+
+    workers is the number of processes (None = one per core). With one worker the chunks
+    are run in this process. Otherwise two chunks per worker are kept in flight, so the
+    pool is always busy but we never queue up more work than we might need.
+    '''
+    workers = workers or os.cpu_count() or 1
+    chunks = count(start, chunk_size)
+
+    if workers == 1:
+        for lo in chunks:
+            yield func(*args, lo, lo + chunk_size)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        try:
+            for lo in chunks:
+                pending.append(pool.submit(func, *args, lo, lo + chunk_size))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+        finally:
+            for future in pending: # caller has stopped, don't run chunks nobody will read.
+                future.cancel()
@@ -0,0 +1,222 @@
+'''
+Advent of Code - 2016 - Search helpers
+http://adventofcode.com/2016
+
+Last Updated: 2026-Oct-18
+First Created: 2026-Oct-18
+Python 3.5
+Chris
+
+One A* search for all the days that need it (Day 11, 13, 17, 22, 24), instead of a
+slightly different copy in each file. Based on Peter Norvig's astar_search (see
+norvig_template_functions.py), with hooks for the bits each day changed:
+
+    goal_func - is this state a goal? (default h_func(state) == 0)
+    key_func - canonical key used to spot duplicate states, e.g Day 11 treats states
+               which only differ by swapping materials as the same.
+    all_goals - keep searching after a goal, and return the paths to every goal found (Day 17).
+    stats - a SearchStats to fill in, to compare heuristics and state encodings.
+    reconstruct - what to return for a goal, from the previous dict (default Path, the list
+                  of states). Pass path_length if you only need the number of states.
+
+bidirectional_search is a breadth first search from both ends at once, for unit cost
+undirected graphs with a single known goal (Day 13 maze, Day 22 node grid).
+
+DistanceField is a breadth first sweep from one start to every state within a step budget,
+so "how far is x" and "how many within n steps" questions don't need a search each (Day 13).
+
+Paths are rebuilt iteratively by walking previous, so long paths don't hit the recursion
+limit or copy the list at every step.
+
+'''
+
+import heapq
+from itertools import accumulate
+from timeit import default_timer as timer
+
+
+class SearchStats():
+    '''
+    Counters filled in by astar_search.
+    '''
+    def __init__(self):
+        self.expanded = 0      # states popped from the frontier and expanded
+        self.generated = 0     # states pushed onto the frontier
+        self.frontier_peak = 0 # largest size of the frontier
+        self.goals = 0         # goal states found
+        self.time = 0.0        # total seconds
+
+    def time_per_expansion(self):
+        return self.time / self.expanded if self.expanded else 0.0
+
+    def __repr__(self):
+        return 'Expanded: {}, Generated: {}, Frontier peak: {}, Goals: {}, Time: {:.2f} secs ({:.1f} us per expansion)'.format(
+            self.expanded, self.generated, self.frontier_peak, self.goals, self.time, self.time_per_expansion() * 1e6)
+
+def reverse_path(previous, s):
+    "Generator. Yields state s, then the state before it, and so on back to the start state."
+    while s is not None:
+        yield s
+        s = previous[s]
+
+def path_length(previous, s):
+    "Number of states on the path to state s (including start), without building the path."
+    return sum(1 for _ in reverse_path(previous, s))
+
+def Path(previous, s):
+    "Return a list of states that lead to state s, according to the previous dict."
+    path = [None] * path_length(previous, s)
+    idx = len(path)
+    for state in reverse_path(previous, s): # fill from the end, start state goes in path[0]
+        idx -= 1
+        path[idx] = state
+    return path
+
+def astar_search(start, h_func, moves_func, goal_func=None, key_func=None, all_goals=False, stats=None, reconstruct=Path):
+    '''
+    Find a shortest sequence of states from start to a goal state.
+    Every move costs 1, h_func(state) estimates the number of moves left.
+
+    Returns the path (list of states from start to goal), or None if there isn't one.
+    With all_goals, returns a list of paths, one for every goal found.
+    (Or whatever reconstruct returns instead of the path.)
+
+    Frontier entries are (f, g, state), so a state popped after a cheaper path to its key
+    was found is skipped rather than expanded again.
+    '''
+    if goal_func is None:
+        goal_func = lambda s: h_func(s) == 0
+    begin = timer()
+
+    frontier = [(h_func(start), 0, start)]    # A priority queue, ordered by f = g + h
+    previous = {start: None}                   # start state has no previous state
+    path_cost = {key_func(start) if key_func else start: 0} # The cost of the best path to a state (by key).
+    answers = []
+    expanded = generated = 0
+    frontier_peak = 1
+
+    while frontier:
+        f, g, s = heapq.heappop(frontier)
+        if g > path_cost[key_func(s) if key_func else s]:
+            continue
+        if goal_func(s):
+            answers.append(reconstruct(previous, s))
+            if all_goals:
+                continue # don't expand a goal, carry on to find the rest.
+            break
+        expanded += 1
+        new_cost = g + 1
+        for s2 in moves_func(s):
+            key = key_func(s2) if key_func else s2
+            if key not in path_cost or new_cost < path_cost[key]:
+                heapq.heappush(frontier, (new_cost + h_func(s2), new_cost, s2))
+                path_cost[key] = new_cost
+                previous[s2] = s
+                generated += 1
+        if len(frontier) > frontier_peak:
+            frontier_peak = len(frontier)
+
+    if stats is not None:
+        stats.expanded += expanded
+        stats.generated += generated
+        stats.frontier_peak = max(stats.frontier_peak, frontier_peak)
+        stats.goals += len(answers)
+        stats.time += timer() - begin
+
+    if all_goals:
+        return answers
+    return answers[0] if answers else None
+
+def bidirectional_search(start, goal, moves_func, length_only=False, stats=None):
+    '''
+    Breadth first search from start and goal at the same time, meeting in the middle.
+    Only for undirected graphs where every move costs 1 (moves_func is used in both directions).
+
+    Each round expands one whole level of the smaller side. Any state it reaches which the
+    other side has already seen is a meeting point; the best meeting point found in that level
+    gives a shortest path.
+
+    Returns the path (list of states from start to goal), or the number of states on it if
+    length_only, or None if there isn't one.
+    '''
+    begin = timer()
+    sides = [({start: None}, [start]), ({goal: None}, [goal])] # (previous, frontier) from each end
+    depths = [{start: 0}, {goal: 0}]
+    expanded = generated = 0
+    frontier_peak = 1
+    meet = start if start == goal else None
+
+    while meet is None and sides[0][1] and sides[1][1]:
+        side = 0 if len(sides[0][1]) <= len(sides[1][1]) else 1
+        previous, frontier = sides[side]
+        depth, other_depth = depths[side], depths[1 - side]
+        best = None
+        next_frontier = []
+        for s in frontier:
+            expanded += 1
+            new_depth = depth[s] + 1
+            for s2 in moves_func(s):
+                if s2 in depth:
+                    continue
+                previous[s2] = s
+                depth[s2] = new_depth
+                next_frontier.append(s2)
+                generated += 1
+                if s2 in other_depth and (best is None or new_depth + other_depth[s2] < best[0]):
+                    best = (new_depth + other_depth[s2], s2)
+        sides[side] = (previous, next_frontier)
+        frontier_peak = max(frontier_peak, len(sides[0][1]) + len(sides[1][1]))
+        if best is not None:
+            meet = best[1]
+
+    if stats is not None:
+        stats.expanded += expanded
+        stats.generated += generated
+        stats.frontier_peak = max(stats.frontier_peak, frontier_peak)
+        stats.goals += meet is not None
+        stats.time += timer() - begin
+
+    if meet is None:
+        return None
+    if length_only:
+        return depths[0][meet] + depths[1][meet] + 1
+    return Path(sides[0][0], meet) + list(reverse_path(sides[1][0], meet))[1:]
+
+class DistanceField():
+    '''
+    Distances from start to every state reachable within max_steps moves (None = no limit),
+    found in one level-synchronous breadth first sweep: every state at distance n is found
+    before any at n + 1, so each recorded distance is the shortest.
+    '''
+    def __init__(self, start, moves_func, max_steps=None):
+        self.max_steps = max_steps
+        self.distances = {start: 0}
+        level_sizes = [1] # number of states at each distance
+        frontier = [start]
+        while frontier and (max_steps is None or len(level_sizes) <= max_steps):
+            steps = len(level_sizes)
+            next_frontier = []
+            for s in frontier:
+                for s2 in moves_func(s):
+                    if s2 not in self.distances:
+                        self.distances[s2] = steps
+                        next_frontier.append(s2)
+            if next_frontier:
+                level_sizes.append(len(next_frontier))
+            frontier = next_frontier
+        self.complete = not frontier # everything reachable has been found, not just within max_steps
+        self.counts = list(accumulate(level_sizes)) # counts[n] = number of states within n moves
+
+    def distance_to(self, state):
+        '''
+        Shortest number of moves to state, or None if it can't be reached (within max_steps).
+        '''
+        return self.distances.get(state)
+
+    def count_within(self, steps):
+        '''
+        Number of states (including start) which can be reached in at most steps moves.
+        '''
+        if not self.complete and steps > self.max_steps:
+            raise ValueError('Only searched {} steps'.format(self.max_steps))
+        return self.counts[min(steps, len(self.counts) - 1)]